@@ -16,6 +16,7 @@ DEEPSEEK_MODEL = "deepseek-chat"
 OPENAI_MODEL = "gpt-4o-mini"
 
 MAX_REFLECTIONS = 2
+MAX_CONCURRENT_PARAGRAPHS = 3
 SEARCH_RESULTS_PER_QUERY = 3
 SEARCH_CONTENT_MAX_LENGTH = 20000
 OUTPUT_DIR = "reports"
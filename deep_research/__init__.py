@@ -3,10 +3,29 @@ Deep Search Agent
 一个无框架的深度搜索AI代理实现
 """
 
-from .agent import DeepSearchAgent, create_agent
+import importlib
+
 from .utils.config import Config, load_config
 
 __version__ = "1.0.0"
 __author__ = "Deep Search Agent Team"
 
 __all__ = ["DeepSearchAgent", "create_agent", "Config", "load_config"]
+
+# Agent依赖LLM、节点和搜索工具，首次访问时才导入，避免只用配置时加载整个依赖链
+_LAZY_ATTRS = {
+    "DeepSearchAgent": ".agent",
+    "create_agent": ".agent",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        value = getattr(importlib.import_module(_LAZY_ATTRS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRS))
@@ -4,39 +4,72 @@ Deep Search Agent主类
 """
 
 import os
+import asyncio
+import logging
 from datetime import datetime
-from typing import Optional, Dict, Any
-
-from deep_research.llms import DeepSeekLLM, OpenAILLM, BaseLLM
-from deep_research.nodes import (
-    ReportStructureNode,
-    FirstSearchNode,
-    ReflectionNode,
-    FirstSummaryNode,
-    ReflectionSummaryNode,
-    ReportFormattingNode
-)
+from typing import Optional, Dict, Any, List
+
+from deep_research.llms import BaseLLM, CachedLLM
 from deep_research.state import State
-from deep_research.tools import tavily_search
-from deep_research.utils import Config, load_config, format_search_results_for_prompt, logger
+from deep_research.tools import AsyncTavilySearch
+from deep_research.utils import (
+    Config, load_config, format_search_results_for_prompt, logger, run_sync, gather_or_cancel
+)
+from deep_research.utils.cache import QueryCache
+from deep_research.utils.file_io import atomic_write_bytes
+
+
+class _FilenameCharTable(dict):
+    """
+    生成文件名时str.translate使用的字符映射表
+    
+    保留字母数字（包括中文等非ASCII字符）、空格、-和_，删除其他字符；
+    映射结果在首次遇到某个字符时计算并缓存
+    """
+
+    def __missing__(self, codepoint: int) -> Optional[str]:
+        char = chr(codepoint)
+        mapped = char if char.isalnum() or char in " -_" else None
+        self[codepoint] = mapped
+        return mapped
+
+
+_FILENAME_TABLE = _FilenameCharTable()
 
 
 class DeepSearchAgent:
     """Deep Search Agent主类"""
 
-    def __init__(self, config: Optional[Config] = None):
+    def __init__(self, config: Optional[Config] = None,
+                 search_client: Optional[AsyncTavilySearch] = None):
         """
         初始化Deep Search Agent
         
         Args:
             config: 配置对象，如果不提供则自动加载
+            search_client: 搜索客户端，如果不提供则根据配置创建
         """
         # 加载配置
         self.config = config or load_config()
 
+        # 初始化搜索客户端，在Agent生命周期内复用连接
+        self.search_client = search_client or AsyncTavilySearch(self.config.tavily_api_key)
+
         # 初始化LLM客户端
         self.llm_client = self._initialize_llm()
 
+        # 初始化缓存，同一Agent的多次研究共享缓存
+        self.search_cache: Optional[QueryCache] = None
+        if self.config.enable_cache:
+            self.search_cache = QueryCache(
+                self.config.cache_max_entries,
+                similarity_threshold=self.config.cache_similarity_threshold
+            )
+        if self.config.enable_cache and self.config.enable_llm_cache:
+            self.llm_client = CachedLLM(
+                self.llm_client, QueryCache(self.config.cache_max_entries, normalize=False)
+            )
+
         # 初始化节点
         self._initialize_nodes()
 
@@ -50,13 +83,15 @@ class DeepSearchAgent:
         logger.info(f"使用LLM: {self.llm_client.get_model_info()}")
 
     def _initialize_llm(self) -> BaseLLM:
-        """初始化LLM客户端"""
+        """初始化LLM客户端，只导入实际使用的提供商实现"""
         if self.config.default_llm_provider == "deepseek":
+            from deep_research.llms.deepseek import DeepSeekLLM
             return DeepSeekLLM(
                 api_key=self.config.deepseek_api_key,
                 model_name=self.config.deepseek_model
             )
         elif self.config.default_llm_provider == "openai":
+            from deep_research.llms.openai_llm import OpenAILLM
             return OpenAILLM(
                 api_key=self.config.openai_api_key,
                 model_name=self.config.openai_model
@@ -66,6 +101,14 @@ class DeepSearchAgent:
 
     def _initialize_nodes(self):
         """初始化处理节点"""
+        from deep_research.nodes import (
+            FirstSearchNode,
+            ReflectionNode,
+            FirstSummaryNode,
+            ReflectionSummaryNode,
+            ReportFormattingNode
+        )
+
         self.first_search_node = FirstSearchNode(self.llm_client)
         self.reflection_node = ReflectionNode(self.llm_client)
         self.first_summary_node = FirstSummaryNode(self.llm_client)
@@ -74,7 +117,20 @@ class DeepSearchAgent:
 
     def research(self, query: str, save_report: bool = True) -> str:
         """
-        执行深度研究
+        执行深度研究（aresearch的同步封装）
+        
+        Args:
+            query: 研究查询
+            save_report: 是否保存报告到文件
+            
+        Returns:
+            最终报告内容
+        """
+        return run_sync(self.aresearch(query, save_report))
+
+    async def aresearch(self, query: str, save_report: bool = True) -> str:
+        """
+        异步执行深度研究
         
         Args:
             query: 研究查询
@@ -89,20 +145,22 @@ class DeepSearchAgent:
 
         try:
             # Step 1: 生成报告结构
-            self._generate_report_structure(query)
+            await self._generate_report_structure(query)
 
-            # Step 2: 处理每个段落
-            self._process_paragraphs()
+            # Step 2: 并发处理每个段落
+            await self._process_paragraphs()
 
             # Step 3: 生成最终报告
-            final_report = self._generate_final_report()
+            final_report = await self._generate_final_report()
 
             # Step 4: 保存报告
             if save_report:
                 self._save_report(final_report)
 
             print(f"\n{'=' * 60}")
-            logger.info(f"深度研究完成！{final_report}")
+            logger.info("深度研究完成！")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"最终报告:\n{final_report}")
             print(f"{'=' * 60}")
 
             return final_report
@@ -110,42 +168,61 @@ class DeepSearchAgent:
         except Exception as e:
             logger.error(f"研究过程中发生错误: {str(e)}")
             raise e
+        finally:
+            # 释放当前事件循环上的连接池
+            await self.aclose()
+
+    async def aclose(self):
+        """释放LLM和搜索客户端占用的连接"""
+        await self.llm_client.aclose()
+        await self.search_client.aclose()
 
-    def _generate_report_structure(self, query: str):
+    async def _generate_report_structure(self, query: str):
         """生成报告结构"""
         logger.info(f"\n[步骤 1] 生成报告结构...")
 
         # 创建报告结构节点
+        from deep_research.nodes import ReportStructureNode
         report_structure_node = ReportStructureNode(self.llm_client, query)
 
         # 生成结构并更新状态
-        self.state = report_structure_node.mutate_state(state=self.state)
+        self.state = await report_structure_node.amutate_state(state=self.state)
 
         logger.info(f"报告结构已生成，共 {len(self.state.paragraphs)} 个段落:")
         for i, paragraph in enumerate(self.state.paragraphs, 1):
             logger.info(f"  {i}. {paragraph.title}")
 
-    def _process_paragraphs(self):
-        """处理所有段落"""
-        total_paragraphs = len(self.state.paragraphs)
-
-        for i in range(total_paragraphs):
-            logger.info(f"\n[步骤 2.{i + 1}] 处理段落: {self.state.paragraphs[i].title}")
+    async def _process_paragraphs(self):
+        """并发处理所有段落"""
+        # 段落之间相互独立，使用信号量限制并发数以遵守LLM提供商的限流
+        semaphore = asyncio.Semaphore(max(1, self.config.max_concurrent_paragraphs))
+
+        # 任意段落失败时取消其余段落，保证 aclose 之后不再有请求在后台运行
+        await gather_or_cancel(*(
+            self._process_one_paragraph(i, semaphore)
+            for i in range(len(self.state.paragraphs))
+        ))
+
+    async def _process_one_paragraph(self, paragraph_index: int, semaphore: asyncio.Semaphore):
+        """处理单个段落：初始搜索总结和反思循环"""
+        async with semaphore:
+            paragraph = self.state.paragraphs[paragraph_index]
+            logger.info(f"\n[步骤 2.{paragraph_index + 1}] 处理段落: {paragraph.title}")
             print("-" * 50)
 
             # 初始搜索和总结
-            self._initial_search_and_summary(i)
+            await self._initial_search_and_summary(paragraph_index)
 
             # 反思循环
-            self._reflection_loop(i)
+            await self._reflection_loop(paragraph_index)
 
             # 标记段落完成
-            self.state.paragraphs[i].research.mark_completed()
+            paragraph.research.mark_completed()
 
-            progress = (i + 1) / total_paragraphs * 100
-            logger.info(f"段落处理完成 ({progress:.1f}%)")
+        progress = self.state.get_completed_paragraphs_count() / len(self.state.paragraphs) * 100
+        logger.info(f"段落 {paragraph_index + 1} 处理完成 ({progress:.1f}%)")
 
-    def _initial_search_and_summary(self, paragraph_index: int):
+    async def _initial_search_and_summary(self, paragraph_index: int):
         """执行初始搜索和总结"""
         paragraph = self.state.paragraphs[paragraph_index]
 
@@ -157,7 +234,7 @@ class DeepSearchAgent:
 
         # 生成搜索查询
         logger.info("_initial_search_and_summary - 生成搜索查询...")
-        search_output = self.first_search_node.run(search_input)
+        search_output = await self.first_search_node.arun(search_input)
         search_query = search_output["search_query"]
         reasoning = search_output["reasoning"]
 
@@ -166,12 +243,7 @@ class DeepSearchAgent:
 
         # 执行搜索
         logger.info("_initial_search_and_summary - 执行网络搜索...")
-        search_results = tavily_search(
-            search_query,
-            max_results=self.config.max_search_results,
-            timeout=self.config.search_timeout,
-            api_key=self.config.tavily_api_key
-        )
+        search_results = await self._search(search_query)
 
         if search_results:
             logger.info(f"_initial_search_and_summary - 找到 {len(search_results)} 个搜索结果")
@@ -182,6 +254,7 @@ class DeepSearchAgent:
 
         # 更新状态中的搜索历史
         paragraph.research.add_search_results(search_query, search_results)
+        search_results = paragraph.research.filter_new_results(search_results)
 
         # 生成初始总结
         logger.info("_initial_search_and_summary - 生成初始总结...")
@@ -194,16 +267,18 @@ class DeepSearchAgent:
             )
         }
 
-        logger.info(f"_initial_search_and_summary - summary_input {summary_input}")
+        # 大体积的输入只在DEBUG级别下才序列化输出
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"_initial_search_and_summary - summary_input {summary_input}")
 
         # 更新状态
-        self.state = self.first_summary_node.mutate_state(
+        self.state = await self.first_summary_node.amutate_state(
             summary_input, self.state, paragraph_index
         )
 
         logger.info("_initial_search_and_summary- 初始总结完成")
 
-    def _reflection_loop(self, paragraph_index: int):
+    async def _reflection_loop(self, paragraph_index: int):
         """执行反思循环"""
         paragraph = self.state.paragraphs[paragraph_index]
 
@@ -218,26 +293,37 @@ class DeepSearchAgent:
             }
 
             # 生成反思搜索查询
-            reflection_output = self.reflection_node.run(reflection_input)
-            search_query = reflection_output["search_query"]
+            reflection_output = await self.reflection_node.arun(reflection_input)
+            search_queries = reflection_output.get("search_queries") or [reflection_output["search_query"]]
+            search_queries = search_queries[:max(1, self.config.max_queries_per_reflection)]
+            search_query = "；".join(search_queries)
             reasoning = reflection_output["reasoning"]
 
             logger.info(f"_reflection_loop 反思查询: {search_query}")
             logger.info(f"_reflection_loop 反思推理: {reasoning}")
 
-            # 执行反思搜索
-            search_results = tavily_search(
-                search_query,
-                max_results=self.config.max_search_results,
-                timeout=self.config.search_timeout,
-                api_key=self.config.tavily_api_key
-            )
+            # 并发执行本轮的所有反思搜索
+            results_per_query = await asyncio.gather(*(self._search(q) for q in search_queries))
+
+            # 更新搜索历史并合并结果
+            search_results = []
+            for query, results in zip(search_queries, results_per_query):
+                paragraph.research.add_search_results(query, results)
+                search_results.extend(results)
 
-            if search_results:
-                logger.info(f"_reflection_loop 找到 {len(search_results)} 个反思搜索结果")
+            # 去掉之前已经提供给LLM的结果，避免重复消耗提示词
+            found_count = len(search_results)
+            search_results = paragraph.research.filter_new_results(search_results)
 
-            # 更新搜索历史
-            paragraph.research.add_search_results(search_query, search_results)
+            if not search_results:
+                # 没有新内容时不调用LLM，避免在没有新证据的情况下重写总结
+                logger.info(f"_reflection_loop 反思 {reflection_i + 1} 未找到新的搜索结果（共 {found_count} 个），跳过总结")
+                paragraph.research.increment_reflection()
+                continue
+
+            logger.info(
+                f"_reflection_loop 找到 {found_count} 个反思搜索结果，其中 {len(search_results)} 个为新结果"
+            )
 
             # 生成反思总结
             reflection_summary_input = {
@@ -249,30 +335,49 @@ class DeepSearchAgent:
                 ),
                 "paragraph_latest_state": paragraph.research.latest_summary
             }
-            logger.info(f"_reflection_loop reflection_summary_input {reflection_summary_input}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"_reflection_loop reflection_summary_input {reflection_summary_input}")
 
             # 更新状态
-            self.state = self.reflection_summary_node.mutate_state(
+            self.state = await self.reflection_summary_node.amutate_state(
                 reflection_summary_input, self.state, paragraph_index
             )
 
             logger.info(f"_reflection_loop 反思 {reflection_i + 1} 完成")
 
-    def _generate_final_report(self) -> str:
+    async def _search(self, query: str) -> List[Dict[str, Any]]:
+        """使用配置的参数执行一次网络搜索，优先使用缓存"""
+        if self.search_cache is not None:
+            cached = self.search_cache.get(query)
+            if cached is not None:
+                logger.info(f"搜索缓存命中: {query}")
+                return list(cached)
+
+        results = await self.search_client.search(
+            query,
+            max_results=self.config.max_search_results,
+            timeout=self.config.search_timeout
+        )
+        search_results = [result.to_dict() for result in results]
+
+        # 搜索失败时返回空列表，不缓存
+        if search_results and self.search_cache is not None:
+            self.search_cache.set(query, search_results)
+        return search_results
+
+    async def _generate_final_report(self) -> str:
         """生成最终报告"""
         logger.info(f"\n[步骤 3] 生成最终报告...")
 
-        # 准备报告数据
-        report_data = []
-        for paragraph in self.state.paragraphs:
-            report_data.append({
-                "title": paragraph.title,
-                "paragraph_latest_state": paragraph.research.latest_summary
-            })
+        # 准备报告数据：(标题, 内容)二元组的不可变元组，LLM格式化和备用方法共用
+        report_data = tuple(
+            (paragraph.title, paragraph.research.latest_summary)
+            for paragraph in self.state.paragraphs
+        )
 
         # 格式化报告
         try:
-            final_report = self.report_formatting_node.run(report_data)
+            final_report = await self.report_formatting_node.arun(report_data)
         except Exception as e:
             logger.error(f"_generate_final_report LLM格式化失败，使用备用方法: {str(e)}")
             final_report = self.report_formatting_node.format_report_manually(
@@ -284,22 +389,21 @@ class DeepSearchAgent:
         self.state.mark_completed()
 
         logger.info("_generate_final_report 最终报告生成完成")
-        logger.info(f"_generate_final_report 生成的最终报告\n {final_report}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"_generate_final_report 生成的最终报告\n {final_report}")
         return final_report
 
     def _save_report(self, report_content: str):
         """保存报告到文件"""
         # 生成文件名
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        query_safe = "".join(c for c in self.state.query if c.isalnum() or c in (' ', '-', '_')).rstrip()
-        query_safe = query_safe.replace(' ', '_')[:30]
+        query_safe = self.state.query[:30].translate(_FILENAME_TABLE).rstrip().replace(' ', '_')
 
         filename = f"deep_search_report_{query_safe}_{timestamp}.md"
         filepath = os.path.join(self.config.output_dir, filename)
 
-        # 保存报告
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(report_content)
+        # 保存报告，原子写入避免中断时留下不完整的文件
+        atomic_write_bytes(filepath, report_content.encode('utf-8'))
 
         logger.info(f"报告已保存到: {filepath}")
 
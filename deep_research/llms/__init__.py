@@ -3,8 +3,27 @@ LLM调用模块
 支持多种大语言模型的统一接口
 """
 
+import importlib
+
 from .base import BaseLLM
-from .deepseek import DeepSeekLLM
-from .openai_llm import OpenAILLM
+from .cached import CachedLLM
+
+__all__ = ["BaseLLM", "DeepSeekLLM", "OpenAILLM", "CachedLLM"]
+
+# 各提供商实现依赖openai/httpx，首次访问时才导入
+_LAZY_ATTRS = {
+    "DeepSeekLLM": ".deepseek",
+    "OpenAILLM": ".openai_llm",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        value = getattr(importlib.import_module(_LAZY_ATTRS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-__all__ = ["BaseLLM", "DeepSeekLLM", "OpenAILLM"]
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRS))
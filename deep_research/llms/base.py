@@ -3,8 +3,9 @@ LLM基础抽象类
 定义所有LLM实现需要遵循的接口标准
 """
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 
 class BaseLLM(ABC):
@@ -36,6 +37,42 @@ class BaseLLM(ABC):
         """
         pass
 
+    async def ainvoke(self, system_prompt: str, user_prompt: str, **kwargs) -> str:
+        """
+        异步调用LLM生成回复
+        
+        默认在线程池中执行同步的invoke，子类可以覆盖为原生异步实现
+        
+        Args:
+            system_prompt: 系统提示词
+            user_prompt: 用户输入
+            **kwargs: 其他参数，如temperature、max_tokens等
+            
+        Returns:
+            LLM生成的回复文本
+        """
+        return await asyncio.to_thread(self.invoke, system_prompt, user_prompt, **kwargs)
+
+    async def astream(self, system_prompt: str, user_prompt: str, **kwargs) -> AsyncIterator[str]:
+        """
+        以流式方式异步生成回复，逐段产出文本
+        
+        默认一次性产出ainvoke的完整结果，支持流式接口的子类可以覆盖
+        
+        Args:
+            system_prompt: 系统提示词
+            user_prompt: 用户输入
+            **kwargs: 其他参数，如temperature、max_tokens等
+            
+        Yields:
+            回复文本片段
+        """
+        yield await self.ainvoke(system_prompt, user_prompt, **kwargs)
+
+    async def aclose(self):
+        """释放异步客户端占用的连接等资源，默认无需处理"""
+        pass
+
     @abstractmethod
     def get_default_model(self) -> str:
         """
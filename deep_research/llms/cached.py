@@ -0,0 +1,86 @@
+"""
+带缓存的LLM封装
+对相同的提示词直接返回缓存的回复，避免重复调用API
+"""
+
+import hashlib
+from typing import Any, AsyncIterator, Dict
+
+from deep_research.llms.base import BaseLLM
+from deep_research.utils.cache import QueryCache
+
+
+class CachedLLM(BaseLLM):
+    """为任意LLM实现添加回复缓存的封装类"""
+
+    def __init__(self, llm: BaseLLM, cache: QueryCache):
+        """
+        初始化缓存封装
+
+        Args:
+            llm: 被封装的LLM客户端
+            cache: 回复缓存
+        """
+        super().__init__(llm.api_key, llm.model_name)
+        self.llm = llm
+        self.cache = cache
+
+    @staticmethod
+    def _cache_key(system_prompt: str, user_prompt: str, **kwargs) -> str:
+        """按系统提示词、调用参数和用户输入生成缓存键"""
+        system_hash = hashlib.sha1(system_prompt.encode("utf-8")).hexdigest()
+        params = repr(sorted(kwargs.items()))
+        return f"{system_hash}:{params}:{user_prompt}"
+
+    def invoke(self, system_prompt: str, user_prompt: str, **kwargs) -> str:
+        """调用LLM生成回复，命中缓存时直接返回"""
+        key = self._cache_key(system_prompt, user_prompt, **kwargs)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        response = self.llm.invoke(system_prompt, user_prompt, **kwargs)
+        if response:
+            self.cache.set(key, response)
+        return response
+
+    async def ainvoke(self, system_prompt: str, user_prompt: str, **kwargs) -> str:
+        """异步调用LLM生成回复，命中缓存时直接返回"""
+        key = self._cache_key(system_prompt, user_prompt, **kwargs)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        response = await self.llm.ainvoke(system_prompt, user_prompt, **kwargs)
+        if response:
+            self.cache.set(key, response)
+        return response
+
+    async def astream(self, system_prompt: str, user_prompt: str, **kwargs) -> AsyncIterator[str]:
+        """流式调用LLM，命中缓存时一次性产出缓存的回复，未命中时在流结束后写入缓存"""
+        key = self._cache_key(system_prompt, user_prompt, **kwargs)
+        cached = self.cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        parts = []
+        async for part in self.llm.astream(system_prompt, user_prompt, **kwargs):
+            parts.append(part)
+            yield part
+
+        response = self.validate_response("".join(parts))
+        if response:
+            self.cache.set(key, response)
+
+    async def aclose(self):
+        """释放被封装客户端的资源"""
+        await self.llm.aclose()
+
+    def get_default_model(self) -> str:
+        """获取默认模型名称"""
+        return self.llm.get_default_model()
+
+    def get_model_info(self) -> Dict[str, Any]:
+        """获取被封装模型的信息"""
+        return self.llm.get_model_info()
@@ -4,9 +4,19 @@ DeepSeek LLM实现
 """
 
 import os
-from typing import Optional, Dict, Any
-from openai import OpenAI
+import asyncio
+from typing import AsyncIterator, Optional, Dict, Any
+
+import httpx
+from openai import AsyncOpenAI
+
 from deep_research.llms.base import BaseLLM
+from deep_research.utils import logger, run_sync
+
+DEEPSEEK_API_BASE = "https://api.deepseek.com"
+
+# 限流（429）、服务端错误和连接错误的重试次数，由openai客户端按指数退避重试，并遵守Retry-After
+DEEPSEEK_MAX_RETRIES = 4
 
 
 class DeepSeekLLM(BaseLLM):
@@ -27,11 +37,9 @@ class DeepSeekLLM(BaseLLM):
 
         super().__init__(api_key, model_name)
 
-        # 初始化OpenAI客户端，使用DeepSeek的endpoint
-        self.client = OpenAI(
-            api_key=self.api_key,
-            base_url="https://api.deepseek.com"
-        )
+        # 异步客户端在首次调用时按事件循环创建，连接池在同一事件循环内复用
+        self.client: Optional[AsyncOpenAI] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
 
         self.default_model = model_name or self.get_default_model()
 
@@ -39,9 +47,53 @@ class DeepSeekLLM(BaseLLM):
         """获取默认模型名称"""
         return "deepseek-chat"
 
+    def _get_client(self) -> AsyncOpenAI:
+        """
+        获取绑定到当前事件循环的异步客户端
+        
+        httpx的连接池与创建它的事件循环绑定，事件循环变化时需要重新创建
+        
+        Returns:
+            AsyncOpenAI客户端
+        """
+        loop = asyncio.get_running_loop()
+        if self.client is None or self._client_loop is not loop:
+            self.client = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=DEEPSEEK_API_BASE,
+                max_retries=DEEPSEEK_MAX_RETRIES,
+                http_client=httpx.AsyncClient(
+                    limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+                    timeout=httpx.Timeout(300.0, connect=10.0)
+                )
+            )
+            self._client_loop = loop
+        return self.client
+
     def invoke(self, system_prompt: str, user_prompt: str, **kwargs) -> str:
         """
-        调用DeepSeek API生成回复
+        调用DeepSeek API生成回复（ainvoke的同步封装）
+        
+        Args:
+            system_prompt: 系统提示词
+            user_prompt: 用户输入
+            **kwargs: 其他参数，如temperature、max_tokens等
+            
+        Returns:
+            DeepSeek生成的回复文本
+        """
+        return run_sync(self._ainvoke_once(system_prompt, user_prompt, **kwargs))
+
+    async def _ainvoke_once(self, system_prompt: str, user_prompt: str, **kwargs) -> str:
+        """调用一次ainvoke，并在临时事件循环结束前关闭绑定到它的连接池"""
+        try:
+            return await self.ainvoke(system_prompt, user_prompt, **kwargs)
+        finally:
+            await self.aclose()
+
+    async def ainvoke(self, system_prompt: str, user_prompt: str, **kwargs) -> str:
+        """
+        异步调用DeepSeek API生成回复
         
         Args:
             system_prompt: 系统提示词
@@ -52,7 +104,7 @@ class DeepSeekLLM(BaseLLM):
             DeepSeek生成的回复文本
         """
         try:
-            # 构建消息
+            # 构建消息，系统提示词始终在最前，保证提示词前缀稳定
             messages = [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt}
@@ -68,7 +120,15 @@ class DeepSeekLLM(BaseLLM):
             }
 
             # 调用API
-            response = self.client.chat.completions.create(**params)
+            response = await self._get_client().chat.completions.create(**params)
+
+            # DeepSeek自动缓存重复的提示词前缀，记录命中情况便于核对缓存效果
+            usage = getattr(response, "usage", None)
+            if usage is not None:
+                logger.debug(
+                    f"DeepSeek usage: prompt={usage.prompt_tokens}, "
+                    f"cache_hit={getattr(usage, 'prompt_cache_hit_tokens', 0)}"
+                )
 
             # 提取回复内容
             if response.choices and response.choices[0].message:
@@ -81,6 +141,55 @@ class DeepSeekLLM(BaseLLM):
             print(f"DeepSeek API调用错误: {str(e)}")
             raise e
 
+    async def astream(self, system_prompt: str, user_prompt: str, **kwargs) -> AsyncIterator[str]:
+        """
+        以流式方式异步调用DeepSeek API，逐段产出生成的文本
+        
+        Args:
+            system_prompt: 系统提示词
+            user_prompt: 用户输入
+            **kwargs: 其他参数，如temperature、max_tokens等
+            
+        Yields:
+            回复文本片段
+        """
+        try:
+            params = {
+                "model": self.default_model,
+                "messages": [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                "temperature": kwargs.get("temperature", 0.7),
+                "max_tokens": kwargs.get("max_tokens", 4000),
+                "stream": True,
+                "stream_options": {"include_usage": True}
+            }
+
+            stream = await self._get_client().chat.completions.create(**params)
+            async for chunk in stream:
+                # 最后一个数据块只包含用量统计，choices为空
+                if chunk.choices:
+                    content = chunk.choices[0].delta.content
+                    if content:
+                        yield content
+                elif getattr(chunk, "usage", None) is not None:
+                    logger.debug(
+                        f"DeepSeek usage: prompt={chunk.usage.prompt_tokens}, "
+                        f"cache_hit={getattr(chunk.usage, 'prompt_cache_hit_tokens', 0)}"
+                    )
+
+        except Exception as e:
+            print(f"DeepSeek API调用错误: {str(e)}")
+            raise e
+
+    async def aclose(self):
+        """关闭异步客户端及其连接池"""
+        if self.client is not None:
+            await self.client.close()
+            self.client = None
+            self._client_loop = None
+
     def get_model_info(self) -> Dict[str, Any]:
         """
         获取当前模型信息
@@ -91,5 +200,5 @@ class DeepSeekLLM(BaseLLM):
         return {
             "provider": "DeepSeek",
             "model": self.default_model,
-            "api_base": "https://api.deepseek.com"
+            "api_base": DEEPSEEK_API_BASE
         }
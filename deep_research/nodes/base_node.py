@@ -4,10 +4,12 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Awaitable, TypeVar
 from deep_research.llms.base import BaseLLM
 from deep_research.state.state import State
-from deep_research.utils import logger
+from deep_research.utils import logger, run_sync
+
+T = TypeVar("T")
 
 
 class BaseNode(ABC):
@@ -25,9 +27,9 @@ class BaseNode(ABC):
         self.node_name = node_name or self.__class__.__name__
 
     @abstractmethod
-    def run(self, input_data: Any, **kwargs) -> Any:
+    async def arun(self, input_data: Any, **kwargs) -> Any:
         """
-        执行节点处理逻辑
+        异步执行节点处理逻辑
         
         Args:
             input_data: 输入数据
@@ -38,6 +40,36 @@ class BaseNode(ABC):
         """
         pass
 
+    def run(self, input_data: Any = None, **kwargs) -> Any:
+        """
+        同步执行节点处理逻辑（arun的同步封装）
+        
+        Args:
+            input_data: 输入数据
+            **kwargs: 额外参数
+            
+        Returns:
+            处理结果
+        """
+        return run_sync(self._run_and_close(self.arun(input_data, **kwargs)))
+
+    async def _run_and_close(self, aw: Awaitable[T]) -> T:
+        """
+        运行协程后释放LLM客户端的连接池
+        
+        同步封装每次调用都使用新的事件循环，绑定到该事件循环的连接池需要在循环结束前关闭
+        
+        Args:
+            aw: 要运行的协程
+            
+        Returns:
+            协程的返回值
+        """
+        try:
+            return await aw
+        finally:
+            await self.llm_client.aclose()
+
     def validate_input(self, input_data: Any) -> bool:
         """
         验证输入数据
@@ -75,9 +107,9 @@ class StateMutationNode(BaseNode):
     """带状态修改功能的节点基类"""
 
     @abstractmethod
-    def mutate_state(self, input_data: Any, state: State, **kwargs) -> State:
+    async def amutate_state(self, input_data: Any, state: State, **kwargs) -> State:
         """
-        修改状态
+        异步修改状态
         
         Args:
             input_data: 输入数据
@@ -88,3 +120,16 @@ class StateMutationNode(BaseNode):
             修改后的状态
         """
         pass
+
+    def mutate_state(self, *args, **kwargs) -> State:
+        """
+        同步修改状态（amutate_state的同步封装）
+        
+        Args:
+            *args: 传递给amutate_state的位置参数
+            **kwargs: 传递给amutate_state的关键字参数
+            
+        Returns:
+            修改后的状态
+        """
+        return run_sync(self._run_and_close(self.amutate_state(*args, **kwargs)))
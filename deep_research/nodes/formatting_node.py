@@ -3,16 +3,23 @@
 负责将最终研究结果格式化为美观的Markdown报告
 """
 
+import io
 import json
-from typing import List, Dict, Any
+import logging
+from functools import lru_cache
+from typing import Any, Dict, Sequence, Tuple, Union
 
 from deep_research.nodes.base_node import BaseNode
 from deep_research.prompts import SYSTEM_PROMPT_REPORT_FORMATTING
+from deep_research.utils import logger
 from deep_research.utils.text_processing import (
     remove_reasoning_from_output,
     clean_markdown_tags
 )
 
+# 段落数据：(标题, 内容)二元组，或包含title和paragraph_latest_state的字典
+ParagraphItem = Union[Tuple[str, str], Dict[str, str]]
+
 
 class ReportFormattingNode(BaseNode):
     """格式化最终报告的节点"""
@@ -26,6 +33,22 @@ class ReportFormattingNode(BaseNode):
         """
         super().__init__(llm_client, "ReportFormattingNode")
 
+    @staticmethod
+    def _is_paragraph_item(item: Any) -> bool:
+        """段落数据可以是(标题, 内容)二元组，也可以是包含title和paragraph_latest_state的字典"""
+        if isinstance(item, tuple):
+            return len(item) == 2
+        return isinstance(item, dict) and "title" in item and "paragraph_latest_state" in item
+
+    @staticmethod
+    def _to_pairs(paragraphs_data: Sequence[ParagraphItem]) -> Tuple[Tuple[str, str], ...]:
+        """将段落数据统一转换为(标题, 内容)二元组的元组"""
+        return tuple(
+            item if isinstance(item, tuple)
+            else (item.get("title", f"段落 {i}"), item.get("paragraph_latest_state", ""))
+            for i, item in enumerate(paragraphs_data, 1)
+        )
+
     def validate_input(self, input_data: Any) -> bool:
         """验证输入数据"""
         if isinstance(input_data, str):
@@ -37,19 +60,16 @@ class ReportFormattingNode(BaseNode):
                 )
             except:
                 return False
-        elif isinstance(input_data, list):
-            return all(
-                isinstance(item, dict) and "title" in item and "paragraph_latest_state" in item
-                for item in input_data
-            )
+        elif isinstance(input_data, (list, tuple)):
+            return all(self._is_paragraph_item(item) for item in input_data)
         return False
 
-    def run(self, input_data: Any, **kwargs) -> str:
+    async def arun(self, input_data: Any, **kwargs) -> str:
         """
         调用LLM生成Markdown格式报告
         
         Args:
-            input_data: 包含所有段落信息的列表
+            input_data: 所有段落的(标题, 内容)二元组序列，或包含段落信息的字典列表
             **kwargs: 额外参数
             
         Returns:
@@ -63,12 +83,22 @@ class ReportFormattingNode(BaseNode):
             if isinstance(input_data, str):
                 message = input_data
             else:
-                message = json.dumps(input_data, ensure_ascii=False)
+                message = json.dumps(
+                    [{"title": title, "paragraph_latest_state": content}
+                     for title, content in self._to_pairs(input_data)],
+                    ensure_ascii=False
+                )
 
             self.log_info("正在格式化最终报告")
 
-            # 调用LLM
-            response = self.llm_client.invoke(SYSTEM_PROMPT_REPORT_FORMATTING, message)
+            # 流式调用LLM，边生成边写入缓冲区
+            buffer = io.StringIO()
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
+            async for part in self.llm_client.astream(SYSTEM_PROMPT_REPORT_FORMATTING, message):
+                buffer.write(part)
+                if debug_enabled:
+                    logger.debug(part, "report_stream")
+            response = buffer.getvalue()
 
             # 处理响应
             processed_response = self.process_output(response)
@@ -109,13 +139,13 @@ class ReportFormattingNode(BaseNode):
             self.log_error(f"处理输出失败: {str(e)}")
             return "# 报告处理失败\n\n报告格式化过程中发生错误。"
 
-    def format_report_manually(self, paragraphs_data: List[Dict[str, str]],
+    def format_report_manually(self, paragraphs_data: Sequence[ParagraphItem],
                                report_title: str = "深度研究报告") -> str:
         """
         手动格式化报告（备用方法）
         
         Args:
-            paragraphs_data: 段落数据列表
+            paragraphs_data: 段落数据，(标题, 内容)二元组或字典的序列
             report_title: 报告标题
             
         Returns:
@@ -123,42 +153,54 @@ class ReportFormattingNode(BaseNode):
         """
         try:
             self.log_info("使用手动格式化方法")
-
-            # 构建报告
-            report_lines = [
-                f"# {report_title}",
-                "",
-                "---",
-                ""
-            ]
-
-            # 添加各个段落
-            for i, paragraph in enumerate(paragraphs_data, 1):
-                title = paragraph.get("title", f"段落 {i}")
-                content = paragraph.get("paragraph_latest_state", "")
-
-                if content:
-                    report_lines.extend([
-                        f"## {title}",
-                        "",
-                        content,
-                        "",
-                        "---",
-                        ""
-                    ])
-
-            # 添加结论
-            if len(paragraphs_data) > 1:
-                report_lines.extend([
-                    "## 结论",
-                    "",
-                    "本报告通过深度搜索和研究，对相关主题进行了全面分析。"
-                    "以上各个方面的内容为理解该主题提供了重要参考。",
-                    ""
-                ])
-
-            return "\n".join(report_lines)
+            # 结果按内容缓存，相同数据重复格式化时直接复用
+            return _format_report_manually(self._to_pairs(paragraphs_data), report_title)
 
         except Exception as e:
             self.log_error(f"手动格式化失败: {str(e)}")
             return "# 报告生成失败\n\n无法完成报告格式化。"
+
+
+@lru_cache(maxsize=32)
+def _format_report_manually(paragraphs: Tuple[Tuple[str, str], ...], report_title: str) -> str:
+    """
+    将段落拼接为Markdown报告
+    
+    Args:
+        paragraphs: (标题, 内容)二元组的元组
+        report_title: 报告标题
+        
+    Returns:
+        格式化的Markdown报告
+    """
+    # 构建报告
+    report_lines = [
+        f"# {report_title}",
+        "",
+        "---",
+        ""
+    ]
+
+    # 添加各个段落
+    for title, content in paragraphs:
+        if content:
+            report_lines.extend([
+                f"## {title}",
+                "",
+                content,
+                "",
+                "---",
+                ""
+            ])
+
+    # 添加结论
+    if len(paragraphs) > 1:
+        report_lines.extend([
+            "## 结论",
+            "",
+            "本报告通过深度搜索和研究，对相关主题进行了全面分析。"
+            "以上各个方面的内容为理解该主题提供了重要参考。",
+            ""
+        ])
+
+    return "\n".join(report_lines)
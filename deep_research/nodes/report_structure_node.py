@@ -35,7 +35,7 @@ class ReportStructureNode(StateMutationNode):
         """验证输入数据"""
         return isinstance(self.query, str) and len(self.query.strip()) > 0
 
-    def run(self, input_data: Any = None, **kwargs) -> List[Dict[str, str]]:
+    async def arun(self, input_data: Any = None, **kwargs) -> List[Dict[str, str]]:
         """
         调用LLM生成报告结构
         
@@ -50,7 +50,7 @@ class ReportStructureNode(StateMutationNode):
             self.log_info(f"正在为查询生成报告结构: {self.query}")
 
             # 调用LLM
-            response = self.llm_client.invoke(SYSTEM_PROMPT_REPORT_STRUCTURE, self.query)
+            response = await self.llm_client.ainvoke(SYSTEM_PROMPT_REPORT_STRUCTURE, self.query)
 
             # 处理响应
             processed_response = self.process_output(response)
@@ -120,7 +120,7 @@ class ReportStructureNode(StateMutationNode):
                 }
             ]
 
-    def mutate_state(self, input_data: Any = None, state: State = None, **kwargs) -> State:
+    async def amutate_state(self, input_data: Any = None, state: State = None, **kwargs) -> State:
         """
         将报告结构写入状态
         
@@ -137,7 +137,7 @@ class ReportStructureNode(StateMutationNode):
 
         try:
             # 生成报告结构
-            report_structure = self.run(input_data, **kwargs)
+            report_structure = await self.arun(input_data, **kwargs)
 
             # 设置查询和报告标题
             state.query = self.query
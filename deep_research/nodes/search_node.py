@@ -40,7 +40,7 @@ class FirstSearchNode(BaseNode):
             return "title" in input_data and "content" in input_data
         return False
 
-    def run(self, input_data: Any, **kwargs) -> Dict[str, str]:
+    async def arun(self, input_data: Any, **kwargs) -> Dict[str, str]:
         """
         调用LLM生成搜索查询和理由
         
@@ -64,7 +64,7 @@ class FirstSearchNode(BaseNode):
             self.log_info("正在生成首次搜索查询")
 
             # 调用LLM
-            response = self.llm_client.invoke(SYSTEM_PROMPT_FIRST_SEARCH, message)
+            response = await self.llm_client.ainvoke(SYSTEM_PROMPT_FIRST_SEARCH, message)
 
             # 处理响应
             processed_response = self.process_output(response)
@@ -147,7 +147,7 @@ class ReflectionNode(BaseNode):
             return all(field in input_data for field in required_fields)
         return False
 
-    def run(self, input_data: Any, **kwargs) -> Dict[str, str]:
+    async def arun(self, input_data: Any, **kwargs) -> Dict[str, str]:
         """
         调用LLM反思并生成搜索查询
         
@@ -171,7 +171,7 @@ class ReflectionNode(BaseNode):
             self.log_info("正在进行反思并生成新搜索查询")
 
             # 调用LLM
-            response = self.llm_client.invoke(SYSTEM_PROMPT_REFLECTION, message)
+            response = await self.llm_client.ainvoke(SYSTEM_PROMPT_REFLECTION, message)
 
             # 处理响应
             processed_response = self.process_output(response)
@@ -191,7 +191,7 @@ class ReflectionNode(BaseNode):
             output: LLM原始输出
             
         Returns:
-            包含search_query和reasoning的字典
+            包含search_query、search_queries和reasoning的字典
         """
         try:
             # 清理响应文本
@@ -214,8 +214,18 @@ class ReflectionNode(BaseNode):
             if not search_query:
                 raise ValueError("未找到搜索查询")
 
+            # 收集补充查询，去除空值和重复项
+            search_queries = [search_query]
+            additional_queries = result.get("additional_queries") or []
+            if isinstance(additional_queries, list):
+                for query in additional_queries:
+                    query = query.strip() if isinstance(query, str) else ""
+                    if query and query not in search_queries:
+                        search_queries.append(query)
+
             return {
                 "search_query": search_query,
+                "search_queries": search_queries,
                 "reasoning": reasoning
             }
 
@@ -224,5 +234,6 @@ class ReflectionNode(BaseNode):
             # 返回默认查询
             return {
                 "search_query": "深度研究补充信息",
+                "search_queries": ["深度研究补充信息"],
                 "reasoning": "由于解析失败，使用默认反思搜索查询"
             }
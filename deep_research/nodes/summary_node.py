@@ -42,7 +42,7 @@ class FirstSummaryNode(StateMutationNode):
             return all(field in input_data for field in required_fields)
         return False
 
-    def run(self, input_data: Any, **kwargs) -> str:
+    async def arun(self, input_data: Any, **kwargs) -> str:
         """
         调用LLM生成段落总结
         
@@ -66,7 +66,7 @@ class FirstSummaryNode(StateMutationNode):
             self.log_info("正在生成首次段落总结")
 
             # 调用LLM
-            response = self.llm_client.invoke(SYSTEM_PROMPT_FIRST_SUMMARY, message)
+            response = await self.llm_client.ainvoke(SYSTEM_PROMPT_FIRST_SUMMARY, message)
 
             # 处理响应
             processed_response = self.process_output(response)
@@ -113,7 +113,7 @@ class FirstSummaryNode(StateMutationNode):
             self.log_error(f"处理输出失败: {str(e)}")
             return "段落总结生成失败"
 
-    def mutate_state(self, input_data: Any, state: State, paragraph_index: int, **kwargs) -> State:
+    async def amutate_state(self, input_data: Any, state: State, paragraph_index: int, **kwargs) -> State:
         """
         更新段落的最新总结到状态
         
@@ -128,7 +128,7 @@ class FirstSummaryNode(StateMutationNode):
         """
         try:
             # 生成总结
-            summary = self.run(input_data, **kwargs)
+            summary = await self.arun(input_data, **kwargs)
 
             # 更新状态
             if 0 <= paragraph_index < len(state.paragraphs):
@@ -171,7 +171,7 @@ class ReflectionSummaryNode(StateMutationNode):
             return all(field in input_data for field in required_fields)
         return False
 
-    def run(self, input_data: Any, **kwargs) -> str:
+    async def arun(self, input_data: Any, **kwargs) -> str:
         """
         调用LLM更新段落内容
         
@@ -195,7 +195,7 @@ class ReflectionSummaryNode(StateMutationNode):
             self.log_info("正在生成反思总结")
 
             # 调用LLM
-            response = self.llm_client.invoke(SYSTEM_PROMPT_REFLECTION_SUMMARY, message)
+            response = await self.llm_client.ainvoke(SYSTEM_PROMPT_REFLECTION_SUMMARY, message)
 
             # 处理响应
             processed_response = self.process_output(response)
@@ -242,7 +242,7 @@ class ReflectionSummaryNode(StateMutationNode):
             self.log_error(f"处理输出失败: {str(e)}")
             return "反思总结生成失败"
 
-    def mutate_state(self, input_data: Any, state: State, paragraph_index: int, **kwargs) -> State:
+    async def amutate_state(self, input_data: Any, state: State, paragraph_index: int, **kwargs) -> State:
         """
         将更新后的总结写入状态
         
@@ -257,7 +257,7 @@ class ReflectionSummaryNode(StateMutationNode):
         """
         try:
             # 生成更新后的总结
-            updated_summary = self.run(input_data, **kwargs)
+            updated_summary = await self.arun(input_data, **kwargs)
 
             # 更新状态
             if 0 <= paragraph_index < len(state.paragraphs):
@@ -74,6 +74,10 @@ output_schema_reflection = {
     "type": "object",
     "properties": {
         "search_query": {"type": "string"},
+        "additional_queries": {
+            "type": "array",
+            "items": {"type": "string"}
+        },
         "reasoning": {"type": "string"}
     }
 }
@@ -180,6 +184,7 @@ SYSTEM_PROMPT_REFLECTION = f"""
 
 你可以使用一个网络搜索工具，该工具接受'search_query'作为参数。
 你的任务是反思段落文本的当前状态，思考是否遗漏了主题的某些关键方面，并提供最佳的网络搜索查询来丰富最新状态。
+如果遗漏了多个互不相关的方面，可以在additional_queries中最多再提供2个补充查询，否则返回空数组。
 请按照以下JSON模式定义格式化输出：
 
 <OUTPUT JSON SCHEMA>
@@ -4,10 +4,13 @@ Deep Search Agent状态管理
 """
 
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set
+import hashlib
 import json
 from datetime import datetime
 
+from deep_research.utils.file_io import atomic_write_bytes, dumps_json_bytes
+
 
 @dataclass
 class Search:
@@ -50,6 +53,47 @@ class Research:
     latest_summary: str = ""  # 当前段落的最新总结
     reflection_iteration: int = 0  # 反思迭代次数
     is_completed: bool = False  # 是否完成研究
+    # 已经提供给LLM的结果链接和内容摘要，用于去重，不参与序列化
+    seen_urls: Set[str] = field(default_factory=set, repr=False, compare=False)
+    seen_content_hashes: Set[str] = field(default_factory=set, repr=False, compare=False)
+
+    def __post_init__(self):
+        # 从已有的搜索记录恢复去重集合（例如从文件加载状态时）
+        for search in self.search_history:
+            self._mark_seen(search.url, search.content)
+
+    @staticmethod
+    def _content_hash(content: str) -> str:
+        """按内容开头计算摘要，用于识别不同链接下的相同内容"""
+        return hashlib.sha1(content[:512].encode("utf-8")).hexdigest()
+
+    def _mark_seen(self, url: str, content: str):
+        if url:
+            self.seen_urls.add(url)
+        if content:
+            self.seen_content_hashes.add(self._content_hash(content))
+
+    def filter_new_results(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        过滤掉链接或内容已经出现过的搜索结果，并记录新结果
+        
+        Args:
+            results: 搜索结果列表
+            
+        Returns:
+            未出现过的搜索结果列表
+        """
+        new_results = []
+        for result in results:
+            url = result.get("url", "")
+            content = result.get("content", "")
+            if url and url in self.seen_urls:
+                continue
+            if content and self._content_hash(content) in self.seen_content_hashes:
+                continue
+            self._mark_seen(url, content)
+            new_results.append(result)
+        return new_results
 
     def add_search(self, search: Search):
         """添加搜索记录"""
@@ -246,9 +290,8 @@ class State:
         return cls.from_dict(data)
 
     def save_to_file(self, filepath: str):
-        """保存状态到文件"""
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(self.to_json())
+        """保存状态到文件（原子写入）"""
+        atomic_write_bytes(filepath, dumps_json_bytes(self.to_dict()))
 
     @classmethod
     def load_from_file(cls, filepath: str) -> "State":
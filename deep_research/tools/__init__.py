@@ -3,6 +3,6 @@
 提供外部工具接口，如网络搜索等
 """
 
-from .search import tavily_search, SearchResult
+from .search import tavily_search, AsyncTavilySearch, SearchResult
 
-__all__ = ["tavily_search", "SearchResult"]
+__all__ = ["tavily_search", "AsyncTavilySearch", "SearchResult"]
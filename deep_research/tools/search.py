@@ -4,10 +4,16 @@
 """
 
 import os
+import asyncio
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
+
+import aiohttp
 from tavily import TavilyClient
 
+from deep_research.utils.logger import logger
+from deep_research.utils.retry import retry_with_backoff, parse_retry_after
+
 
 @dataclass
 class SearchResult:
@@ -86,6 +92,122 @@ class TavilySearch:
             return []
 
 
+class AsyncTavilySearch:
+    """基于aiohttp的异步Tavily搜索客户端，在多次搜索间复用连接池"""
+
+    API_URL = "https://api.tavily.com/search"
+
+    # 需要重试的HTTP状态码：限流和服务端错误
+    RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+    def __init__(self, api_key: Optional[str] = None, connection_limit: int = 32):
+        """
+        初始化异步Tavily搜索客户端
+        
+        Args:
+            api_key: Tavily API密钥，如果不提供则从环境变量读取
+            connection_limit: 连接池的最大连接数
+        """
+        if api_key is None:
+            api_key = os.getenv("TAVILY_API_KEY")
+            if not api_key:
+                raise ValueError("Tavily API Key未找到！请设置TAVILY_API_KEY环境变量或在初始化时提供")
+
+        self.api_key = api_key
+        self.connection_limit = connection_limit
+
+        # 会话与创建它的事件循环绑定，在首次搜索时创建
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """获取绑定到当前事件循环的会话"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.connection_limit,
+                    ttl_dns_cache=300,
+                    force_close=False
+                ),
+                headers={"Authorization": f"Bearer {self.api_key}"}
+            )
+            self._session_loop = loop
+        return self._session
+
+    @classmethod
+    def _should_retry(cls, error: BaseException) -> bool:
+        """限流、服务端错误、连接错误和超时可以重试"""
+        if isinstance(error, aiohttp.ClientResponseError):
+            return error.status in cls.RETRY_STATUSES
+        return isinstance(error, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+    @staticmethod
+    def _retry_after(error: BaseException) -> Optional[float]:
+        """读取限流响应中的Retry-After"""
+        headers = getattr(error, "headers", None)
+        if headers is None:
+            return None
+        return parse_retry_after(headers.get("Retry-After"))
+
+    async def search(self, query: str, max_results: int = 5, include_raw_content: bool = True,
+                     timeout: int = 240) -> List[SearchResult]:
+        """
+        执行异步搜索
+        
+        Args:
+            query: 搜索查询
+            max_results: 最大结果数量
+            include_raw_content: 是否包含原始内容
+            timeout: 超时时间（秒）
+            
+        Returns:
+            搜索结果列表
+        """
+        try:
+            # 调用Tavily API
+            payload = {
+                "query": query,
+                "max_results": max_results,
+                "include_raw_content": include_raw_content
+            }
+
+            async def request() -> Dict[str, Any]:
+                async with self._get_session().post(
+                    self.API_URL,
+                    json=payload,
+                    timeout=aiohttp.ClientTimeout(total=timeout)
+                ) as response:
+                    response.raise_for_status()
+                    return await response.json()
+
+            # 瞬时错误按指数退避重试，仍然失败时返回空结果
+            data = await retry_with_backoff(request, self._should_retry, self._retry_after)
+
+            # 解析结果
+            results = []
+            for item in data.get('results', []):
+                results.append(SearchResult(
+                    title=item.get('title', ''),
+                    url=item.get('url', ''),
+                    content=item.get('content', ''),
+                    score=item.get('score')
+                ))
+
+            return results
+
+        except Exception as e:
+            logger.error(f"搜索错误: {str(e)}")
+            return []
+
+    async def aclose(self):
+        """关闭会话及其连接池"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+
+
 # 全局搜索客户端实例
 _tavily_client = None
 
@@ -13,6 +13,7 @@ from .text_processing import (
 )
 
 from .config import Config, load_config
+from .async_utils import run_sync, gather_or_cancel
 from .logger import logger
 
 __all__ = [
@@ -24,5 +25,7 @@ __all__ = [
     "format_search_results_for_prompt",
     "Config",
     "load_config",
+    "run_sync",
+    "gather_or_cancel",
     "logger",
 ]
@@ -0,0 +1,53 @@
+"""
+异步工具函数
+为同步调用方提供运行协程的统一入口
+"""
+
+import asyncio
+from typing import Any, Awaitable, Coroutine, List, TypeVar
+
+try:
+    import uvloop
+except ImportError:  # uvloop为可选依赖（不支持Windows），未安装时使用标准事件循环
+    uvloop = None
+
+T = TypeVar("T")
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    在新的事件循环中运行协程并返回结果
+    
+    安装了uvloop时使用基于libuv的事件循环，否则使用asyncio默认实现
+    
+    Args:
+        coro: 要运行的协程
+        
+    Returns:
+        协程的返回值
+    """
+    if uvloop is not None:
+        return uvloop.run(coro)
+    return asyncio.run(coro)
+
+
+async def gather_or_cancel(*aws: Awaitable[T]) -> List[T]:
+    """
+    并发运行多个协程，任意一个失败时取消其余协程并等待它们结束后再抛出异常
+    
+    行为与Python 3.11的TaskGroup一致，避免调用方清理资源后仍有协程在后台运行
+    
+    Args:
+        *aws: 要并发运行的协程
+        
+    Returns:
+        按顺序排列的各协程返回值
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
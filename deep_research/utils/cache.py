@@ -0,0 +1,120 @@
+"""
+查询缓存
+为网络搜索和LLM调用提供进程内的LRU缓存，避免重复请求
+"""
+
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Optional
+
+
+def normalize_query(text: str) -> str:
+    """
+    规范化查询文本：统一全半角、转小写并合并空白
+
+    标点保持不变，"C++"与"C"、"C#"与"C"、".NET"与"NET"这类查询含义不同，不能视为同一个键
+
+    Args:
+        text: 原始查询
+
+    Returns:
+        规范化后的查询
+    """
+    text = unicodedata.normalize("NFKC", text).lower()
+    return " ".join(text.split())
+
+
+def _bigrams(text: str) -> FrozenSet[str]:
+    """提取字符二元组集合，对中文等不以空格分词的文本同样适用"""
+    compact = text.replace(" ", "")
+    if len(compact) < 2:
+        return frozenset((compact,))
+    return frozenset(compact[i:i + 2] for i in range(len(compact) - 1))
+
+
+class QueryCache:
+    """
+    两级查询缓存
+
+    第一级按规范化后的查询精确匹配；第二级（可选，默认关闭）按字符二元组的Jaccard相似度
+    匹配近似改写的查询。超过容量时按LRU淘汰。
+
+    近似匹配只比较字面相似度而非语义：只差年份或个别词的查询（如"...2024"与"...2025"）
+    得分很高却含义不同，会返回另一个查询的结果，开启前需确认调用场景能接受。
+    """
+
+    def __init__(self, max_entries: int = 256, similarity_threshold: Optional[float] = None,
+                 normalize: bool = True):
+        """
+        初始化缓存
+
+        Args:
+            max_entries: 最大缓存条目数
+            similarity_threshold: 近似匹配的相似度阈值（0-1），为None（默认）时只做精确匹配
+            normalize: 是否在匹配前规范化键
+        """
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.normalize = normalize
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._bigrams: Dict[str, FrozenSet[str]] = {}
+
+    def _make_key(self, key: str) -> str:
+        return normalize_query(key) if self.normalize else key
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        查找缓存
+
+        Args:
+            key: 查询键
+
+        Returns:
+            缓存的值，未命中时返回None
+        """
+        cache_key = self._make_key(key)
+        if cache_key in self._entries:
+            self._entries.move_to_end(cache_key)
+            return self._entries[cache_key]
+
+        if self.similarity_threshold is None or not self._bigrams:
+            return None
+
+        # 近似匹配：找到相似度最高的已缓存查询
+        target = _bigrams(cache_key)
+        best_key, best_score = None, 0.0
+        for candidate, grams in self._bigrams.items():
+            score = len(target & grams) / len(target | grams)
+            if score > best_score:
+                best_key, best_score = candidate, score
+
+        if best_key is not None and best_score >= self.similarity_threshold:
+            self._entries.move_to_end(best_key)
+            return self._entries[best_key]
+        return None
+
+    def set(self, key: str, value: Any):
+        """
+        写入缓存
+
+        Args:
+            key: 查询键
+            value: 要缓存的值
+        """
+        cache_key = self._make_key(key)
+        self._entries[cache_key] = value
+        self._entries.move_to_end(cache_key)
+        if self.similarity_threshold is not None:
+            self._bigrams[cache_key] = _bigrams(cache_key)
+
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._bigrams.pop(evicted, None)
+
+    def clear(self):
+        """清空缓存"""
+        self._entries.clear()
+        self._bigrams.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
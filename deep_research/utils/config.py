@@ -4,13 +4,64 @@
 """
 
 import os
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Mapping, Optional
 
+from .logger import logger
 
-@dataclass
+# 视为真值的布尔配置取值
+_TRUE_SET = frozenset(("1", "true", "yes", "on"))
+
+
+def _parse_bool(value: str) -> bool:
+    """解析布尔类型的配置值"""
+    return value.strip().lower() in _TRUE_SET
+
+
+def _env(source: Mapping[str, str], name: str, default: Any, cast: Callable[[str], Any] = str) -> Any:
+    """
+    读取字符串形式的配置项并转换类型，未设置时直接返回默认值
+    
+    Args:
+        source: 配置来源，如os.environ或解析后的.env文件
+        name: 配置项名称
+        default: 默认值
+        cast: 类型转换函数
+        
+    Returns:
+        转换后的配置值
+    """
+    value = source.get(name)
+    return default if value is None else cast(value)
+
+
+# 字符串配置（环境变量和.env文件）的字段表：(Config字段, 配置项名称, 默认值, 类型转换)
+_STR_FIELDS = (
+    ("deepseek_api_key", "DEEPSEEK_API_KEY", None, str),
+    ("openai_api_key", "OPENAI_API_KEY", None, str),
+    ("tavily_api_key", "TAVILY_API_KEY", None, str),
+    ("default_llm_provider", "DEFAULT_LLM_PROVIDER", "deepseek", str),
+    ("deepseek_model", "DEEPSEEK_MODEL", "deepseek-chat", str),
+    ("openai_model", "OPENAI_MODEL", "gpt-4o-mini", str),
+    ("max_search_results", "SEARCH_RESULTS_PER_QUERY", 3, int),
+    ("search_timeout", "SEARCH_TIMEOUT", 240, int),
+    ("max_content_length", "SEARCH_CONTENT_MAX_LENGTH", 20000, int),
+    ("max_reflections", "MAX_REFLECTIONS", 2, int),
+    ("max_queries_per_reflection", "MAX_QUERIES_PER_REFLECTION", 3, int),
+    ("max_paragraphs", "MAX_PARAGRAPHS", 5, int),
+    ("max_concurrent_paragraphs", "MAX_CONCURRENT_PARAGRAPHS", 3, int),
+    ("enable_cache", "ENABLE_CACHE", True, _parse_bool),
+    ("enable_llm_cache", "ENABLE_LLM_CACHE", False, _parse_bool),
+    ("cache_max_entries", "CACHE_MAX_ENTRIES", 256, int),
+    ("cache_similarity_threshold", "CACHE_SIMILARITY_THRESHOLD", None, float),
+    ("output_dir", "OUTPUT_DIR", "reports", str),
+    ("save_intermediate_states", "SAVE_INTERMEDIATE_STATES", True, _parse_bool),
+)
+
+
+@dataclass(frozen=True)
 class Config:
-    """配置类"""
+    """配置类（不可变，需要修改时使用 dataclasses.replace 创建新实例）"""
     # API密钥
     deepseek_api_key: Optional[str] = None
     openai_api_key: Optional[str] = None
@@ -28,25 +79,47 @@ class Config:
 
     # Agent配置
     max_reflections: int = 2
+    max_queries_per_reflection: int = 3  # 每轮反思并发执行的最大搜索查询数
     max_paragraphs: int = 5
+    max_concurrent_paragraphs: int = 3  # 同时处理的段落数，受LLM提供商限流约束
+
+    # 缓存配置
+    enable_cache: bool = True  # 缓存搜索结果
+    # 缓存LLM回复，默认关闭：缓存在节点解析之前写入，解析失败的回复也会在Agent生命周期内被重复使用
+    enable_llm_cache: bool = False
+    cache_max_entries: int = 256
+    # 搜索查询近似匹配的相似度阈值（0-1），默认关闭只做精确匹配
+    # 近似匹配基于字符二元组的字面相似度而非语义，"...2024"和"...2025"这类含义不同的查询也会被视为相同
+    cache_similarity_threshold: Optional[float] = None
 
     # 输出配置
     output_dir: str = "reports"
     save_intermediate_states: bool = True
 
+    def __repr__(self) -> str:
+        """显示所有配置项，API密钥只显示是否已设置"""
+        items = []
+        for f in fields(self):
+            value = getattr(self, f.name)
+            if f.name.endswith("_api_key") and value:
+                items.append(f"{f.name}=***")
+            else:
+                items.append(f"{f.name}={value!r}")
+        return f"Config({', '.join(items)})"
+
     def validate(self) -> bool:
         """验证配置"""
         # 检查必需的API密钥
         if self.default_llm_provider == "deepseek" and not self.deepseek_api_key:
-            print("错误: DeepSeek API Key未设置")
+            logger.error("DeepSeek API Key未设置", "config")
             return False
 
         if self.default_llm_provider == "openai" and not self.openai_api_key:
-            print("错误: OpenAI API Key未设置")
+            logger.error("OpenAI API Key未设置", "config")
             return False
 
         if not self.tavily_api_key:
-            print("错误: Tavily API Key未设置")
+            logger.error("Tavily API Key未设置", "config")
             return False
 
         return True
@@ -74,7 +147,13 @@ class Config:
                 search_timeout=getattr(config_module, "SEARCH_TIMEOUT", 240),
                 max_content_length=getattr(config_module, "SEARCH_CONTENT_MAX_LENGTH", 20000),
                 max_reflections=getattr(config_module, "MAX_REFLECTIONS", 2),
+                max_queries_per_reflection=getattr(config_module, "MAX_QUERIES_PER_REFLECTION", 3),
                 max_paragraphs=getattr(config_module, "MAX_PARAGRAPHS", 5),
+                max_concurrent_paragraphs=getattr(config_module, "MAX_CONCURRENT_PARAGRAPHS", 3),
+                enable_cache=getattr(config_module, "ENABLE_CACHE", True),
+                enable_llm_cache=getattr(config_module, "ENABLE_LLM_CACHE", False),
+                cache_max_entries=getattr(config_module, "CACHE_MAX_ENTRIES", 256),
+                cache_similarity_threshold=getattr(config_module, "CACHE_SIMILARITY_THRESHOLD", None),
                 output_dir=getattr(config_module, "OUTPUT_DIR", "reports"),
                 save_intermediate_states=getattr(config_module, "SAVE_INTERMEDIATE_STATES", True)
             )
@@ -90,21 +169,20 @@ class Config:
                             key, value = line.split('=', 1)
                             config_dict[key.strip()] = value.strip()
 
-            return cls(
-                deepseek_api_key=config_dict.get("DEEPSEEK_API_KEY"),
-                openai_api_key=config_dict.get("OPENAI_API_KEY"),
-                tavily_api_key=config_dict.get("TAVILY_API_KEY"),
-                default_llm_provider=config_dict.get("DEFAULT_LLM_PROVIDER", "deepseek"),
-                deepseek_model=config_dict.get("DEEPSEEK_MODEL", "deepseek-chat"),
-                openai_model=config_dict.get("OPENAI_MODEL", "gpt-4o-mini"),
-                max_search_results=int(config_dict.get("SEARCH_RESULTS_PER_QUERY", "3")),
-                search_timeout=int(config_dict.get("SEARCH_TIMEOUT", "240")),
-                max_content_length=int(config_dict.get("SEARCH_CONTENT_MAX_LENGTH", "20000")),
-                max_reflections=int(config_dict.get("MAX_REFLECTIONS", "2")),
-                max_paragraphs=int(config_dict.get("MAX_PARAGRAPHS", "5")),
-                output_dir=config_dict.get("OUTPUT_DIR", "reports"),
-                save_intermediate_states=config_dict.get("SAVE_INTERMEDIATE_STATES", "true").lower() == "true"
-            )
+            return cls._from_mapping(config_dict)
+
+    @classmethod
+    def from_env(cls) -> "Config":
+        """从环境变量创建配置"""
+        return cls._from_mapping(os.environ)
+
+    @classmethod
+    def _from_mapping(cls, source: Mapping[str, str]) -> "Config":
+        """按字段表从字符串配置创建配置，取值格式错误时抛出ValueError"""
+        return cls(**{
+            field_name: _env(source, name, default, cast)
+            for field_name, name, default, cast in _STR_FIELDS
+        })
 
 
 def load_config(config_file: Optional[str] = None) -> Config:
@@ -127,7 +205,7 @@ def load_config(config_file: Optional[str] = None) -> Config:
         for config_path in ["config.py", "config.env", ".env"]:
             if os.path.exists(config_path):
                 file_to_load = config_path
-                print(f"已找到配置文件: {config_path}")
+                logger.info("已找到配置文件: %s", "config", config_path)
                 break
         else:
             raise FileNotFoundError("未找到配置文件，请创建 config.py 文件")
@@ -143,21 +221,6 @@ def load_config(config_file: Optional[str] = None) -> Config:
 
 
 def print_config(config: Config):
-    """打印配置信息（隐藏敏感信息）"""
-    print("\n=== 当前配置 ===")
-    print(f"LLM提供商: {config.default_llm_provider}")
-    print(f"DeepSeek模型: {config.deepseek_model}")
-    print(f"OpenAI模型: {config.openai_model}")
-    print(f"最大搜索结果数: {config.max_search_results}")
-    print(f"搜索超时: {config.search_timeout}秒")
-    print(f"最大内容长度: {config.max_content_length}")
-    print(f"最大反思次数: {config.max_reflections}")
-    print(f"最大段落数: {config.max_paragraphs}")
-    print(f"输出目录: {config.output_dir}")
-    print(f"保存中间状态: {config.save_intermediate_states}")
-
-    # 显示API密钥状态（不显示实际密钥）
-    print(f"DeepSeek API Key: {'已设置' if config.deepseek_api_key else '未设置'}")
-    print(f"OpenAI API Key: {'已设置' if config.openai_api_key else '未设置'}")
-    print(f"Tavily API Key: {'已设置' if config.tavily_api_key else '未设置'}")
-    print("==================\n")
+    """输出配置信息（隐藏敏感信息）"""
+    # 使用延迟格式化，日志级别关闭时不会生成配置字符串
+    logger.info("当前配置: %s", "config", config)
@@ -0,0 +1,52 @@
+"""
+文件读写工具
+提供原子写入和JSON序列化为字节的辅助函数
+"""
+
+import json
+import os
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # orjson为可选依赖，未安装时回退到标准库
+    orjson = None
+
+
+def atomic_write_bytes(filepath: str, data: bytes):
+    """
+    原子写入文件：先写入同目录下的临时文件，再用os.replace替换目标文件
+    
+    进程在写入过程中被中断时，目标文件要么保持原样，要么是完整的新内容
+    
+    Args:
+        filepath: 目标文件路径
+        data: 要写入的字节内容
+    """
+    tmp_path = f"{filepath}.tmp"
+    try:
+        # 缓冲写入会循环直到全部字节写完，避免部分写入的文件被替换到目标位置
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())  # 确保内容落盘后再替换，系统崩溃时也不会得到截断的文件
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def dumps_json_bytes(obj: Any) -> bytes:
+    """
+    将对象序列化为缩进2格的UTF-8编码JSON
+    
+    Args:
+        obj: 要序列化的对象
+        
+    Returns:
+        JSON字节串
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
@@ -6,14 +6,49 @@ Desc: 定义日志相关内容
 
 """
 
+import atexit
+import copy
 import json
 import logging
 import logging.handlers
+import queue
 import time
-from functools import lru_cache
 from pathlib import Path
 from uuid import uuid4
 
+try:
+    import orjson
+except ImportError:  # orjson为可选依赖，未安装时回退到标准库
+    orjson = None
+
+if orjson is not None:
+    def _dumps(obj) -> str:
+        """序列化为JSON字符串（orjson实现，原生输出非ASCII字符）"""
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+else:
+    def _dumps(obj) -> str:
+        """序列化为JSON字符串（标准库实现）"""
+        return json.dumps(obj, ensure_ascii=False, default=str)
+
+# 进程级别的 trace_id，导入时生成一次
+TRACE_ID = (str(int(time.time())) + uuid4().hex)[:32]
+
+# 每条日志共享的 extra 字段模板
+_EXTRA_TEMPLATE = {"local_trace": TRACE_ID}
+
+# 日志级别名称与数值的对应关系
+_LEVEL_RELATIONS = {
+    'noset': logging.NOTSET,
+    'debug': logging.DEBUG,
+    'info': logging.INFO,
+    'warning': logging.WARNING,
+    'error': logging.ERROR,
+    'critical': logging.CRITICAL
+}
+
+# 文件日志的后台写入线程，get_logger 初始化时创建
+_file_listener = None
+
 
 # 对整条日志进行着色
 class ColorFormatter(logging.Formatter):
@@ -26,32 +61,30 @@ class ColorFormatter(logging.Formatter):
         'RESET': '\033[0m'  # 重置颜色
     }
 
+    # 字典消息在格式化时的占位符
+    DICT_PLACEHOLDER = "{dict_placeholder}"
+
     def __init__(self, fmt, use_color=True):
         super().__init__(fmt)
         self.use_color = use_color
 
     def format(self, record):
-        # 保存原始消息
-        original_message = record.msg
-
         # 特殊处理字典类型的消息，防止二次序列化
         if isinstance(record.msg, dict):
-            # 先将原始的字典保存下来
-            record.dict_message = record.msg
+            dict_message = record.msg
             # 将msg设置为占位符，避免被格式化
-            record.msg = "{dict_placeholder}"
-
-        # 进行标准格式化
-        formatted_message = super().format(record)
-
-        # 如果是字典消息，替换占位符
-        if hasattr(record, 'dict_message'):
-            # 替换占位符为实际的字典
-            formatted_message = formatted_message.replace('"{dict_placeholder}"',
-                                                          json.dumps(record.dict_message, ensure_ascii=False))
-
-        # 恢复原始消息
-        record.msg = original_message
+            record.msg = self.DICT_PLACEHOLDER
+            try:
+                formatted_message = super().format(record)
+            finally:
+                # 恢复原始消息
+                record.msg = dict_message
+            # 替换占位符为实际的字典，只序列化一次
+            formatted_message = formatted_message.replace(
+                f'"{self.DICT_PLACEHOLDER}"', _dumps(dict_message), 1
+            )
+        else:
+            formatted_message = super().format(record)
 
         # 如果启用了颜色，且日志级别有对应的颜色，则给整条消息添加颜色
         if self.use_color and record.levelname in self.COLORS:
@@ -65,8 +98,8 @@ class JSONFormatter(logging.Formatter):
         log_dict = {
             "time": f"[{self.formatTime(record, self.datefmt)}]",
             "level": f"[{record.levelname}]",
-            "file": f"[{getattr(record, 'real_filename', 'unknown')}]",
-            "line": f"[{getattr(record, 'real_lineno', 0)}]",
+            "file": f"[{record.filename}]",
+            "line": f"[{record.lineno}]",
             "local_trace": getattr(record, "local_trace", ""),
             "category": getattr(record, "category", "")
         }
@@ -77,16 +110,41 @@ class JSONFormatter(logging.Formatter):
         else:
             log_dict["message"] = record.getMessage()  # 否则按常规方式处理
 
-        return json.dumps(log_dict, ensure_ascii=False)
+        # 异常堆栈：队列中的记录已在 prepare 中格式化为 exc_text
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            log_dict["exc_info"] = record.exc_text
+
+        return _dumps(log_dict)
+
+
+_exc_formatter = logging.Formatter()
 
 
-@lru_cache(maxsize=1)
-def get_logger(level='info'):
+class _RecordQueueHandler(logging.handlers.QueueHandler):
+    """把日志记录放入队列，由后台线程写入文件，字典类型的消息保持原样"""
+
+    def prepare(self, record):
+        # 默认实现会把消息格式化成字符串，这里只合并参数，保留字典消息交给 JSONFormatter
+        record = copy.copy(record)
+        if not isinstance(record.msg, dict):
+            record.msg = record.getMessage()
+            record.args = None
+        # 先把异常堆栈格式化成文本再清除 exc_info，避免队列中持有栈帧引用
+        if record.exc_info and not record.exc_text:
+            record.exc_text = _exc_formatter.formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+
+def get_logger():
     """
-    获取日志记录器实例
-    :param level: 日志级别，默认为 info
+    获取日志记录器实例，重复调用返回同一个已初始化的记录器
     :return: 日志记录器
     """
+    global _file_listener
+
     # 创建日志记录器
     logger = logging.getLogger('DeepSearchAgentDemo')
 
@@ -94,24 +152,10 @@ def get_logger(level='info'):
     if logger.handlers:
         return logger
 
-    # 设置输出的等级
-    level_relations = {
-        'noset': logging.NOTSET,
-        'debug': logging.DEBUG,
-        'info': logging.INFO,
-        'warning': logging.WARNING,
-        'error': logging.ERROR,
-        'critical': logging.CRITICAL
-    }
-
-    # 设置日志级别
-    logger_level = level_relations.get(level.lower(), logging.INFO)
+    # 默认日志级别，可以通过 set_level 调整
+    logger_level = logging.INFO
     logger.setLevel(logger_level)
 
-    # 生成 trace_id
-    global trace_id
-    trace_id = (str(int(time.time())) + str(uuid4())).replace('-', '')[:32]
-
     # 确定日志路径
     base_dir = Path(__file__).parent.parent.parent
     log_dir = base_dir / 'logs'
@@ -124,10 +168,10 @@ def get_logger(level='info'):
     log_format = {
         "time": "[%(asctime)s]",
         "level": "[%(levelname)s]",
-        "file": "[%(real_filename)s]",  # 使用我们自定义的属性
-        "line": "[%(real_lineno)d]",  # 使用我们自定义的属性
+        "file": "[%(filename)s]",  # 通过stacklevel定位到实际调用者
+        "line": "[%(lineno)d]",
         "message": "%(message)s",
-        "local_trace": trace_id,
+        "local_trace": TRACE_ID,
         "category": "%(category)s"  # 添加 category 字段
     }
 
@@ -147,9 +191,16 @@ def get_logger(level='info'):
     )
     file_handler.setLevel(logger_level)
     file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
+
+    # 文件写入交给后台线程，调用方（包括事件循环中的协程）只需把记录放入队列
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(_RecordQueueHandler(log_queue))
+    _file_listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+    _file_listener.start()
+    atexit.register(_file_listener.stop)  # 退出时写完队列中剩余的日志
 
     # 创建 StreamHandler，输出到控制台
+    # 控制台保持同步输出，保证与 print 的输出顺序一致
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logger_level)
     console_handler.setFormatter(console_formatter)
@@ -158,12 +209,25 @@ def get_logger(level='info'):
     return logger
 
 
+def set_level(level):
+    """
+    调整日志级别
+    :param level: 日志级别名称（如 'debug'）或 logging 中的级别数值
+    """
+    if isinstance(level, str):
+        level = _LEVEL_RELATIONS.get(level.lower(), logging.INFO)
+
+    base_logger = get_logger()
+    base_logger.setLevel(level)
+    handlers = list(base_logger.handlers)
+    if _file_listener is not None:
+        handlers.extend(_file_listener.handlers)
+    for handler in handlers:
+        handler.setLevel(level)
+
+
 def get_trace_id():
-    global trace_id
-    # 如果全局 trace_id 不存在，初始化一个
-    if not globals().get('trace_id'):
-        trace_id = (str(int(time.time())) + str(uuid4())).replace('-', '')[:32]
-    return trace_id
+    return TRACE_ID
 
 
 # 创建一个支持 category 的 LoggerAdapter 类
@@ -171,77 +235,38 @@ class CategoryLogger:
     def __init__(self, logger):
         self.logger = logger
 
+    def isEnabledFor(self, level) -> bool:
+        """判断指定级别的日志是否会被输出，用于在构造大体积日志前提前判断"""
+        return self.logger.isEnabledFor(level)
+
     def _process_message(self, msg):
         """预处理 message，如果是 dict 类型则不需要再次序列化"""
         if isinstance(msg, dict):
             return msg  # 直接返回字典，避免二次序列化
         return msg
 
-    def _get_caller_info(self):
-        """获取调用者的文件名和行号"""
-        import inspect
-        # 0是当前函数，1是调用当前函数的函数，2是调用调用函数的函数（即实际的调用者）
-        frame = inspect.currentframe().f_back.f_back
-        filename = frame.f_code.co_filename
-        lineno = frame.f_lineno
-        # 只获取文件名，不包括路径
-        filename = Path(filename).name
-        return filename, lineno
+    def _log(self, level, msg, category, args, kwargs):
+        """所有级别共用的日志输出逻辑"""
+        if not self.logger.isEnabledFor(level):
+            return
+        kwargs["extra"] = {**_EXTRA_TEMPLATE, "category": category}
+        # stacklevel=3 跳过 _log 和级别方法，把文件名和行号定位到实际调用者
+        self.logger.log(level, self._process_message(msg), *args, stacklevel=3, **kwargs)
 
     def debug(self, msg, category="", *args, **kwargs):
-        filename, lineno = self._get_caller_info()
-        extra = kwargs.get("extra", {})
-        extra["category"] = category
-        extra["real_filename"] = filename
-        extra["real_lineno"] = lineno
-        extra["local_trace"] = get_trace_id()
-        processed_msg = self._process_message(msg)
-        kwargs["extra"] = extra
-        self.logger.debug(processed_msg, *args, **kwargs)
+        self._log(logging.DEBUG, msg, category, args, kwargs)
 
     def info(self, msg, category="", *args, **kwargs):
-        filename, lineno = self._get_caller_info()
-        extra = kwargs.get("extra", {})
-        extra["category"] = category
-        extra["real_filename"] = filename
-        extra["real_lineno"] = lineno
-        extra["local_trace"] = get_trace_id()
-        processed_msg = self._process_message(msg)
-        kwargs["extra"] = extra
-        self.logger.info(processed_msg, *args, **kwargs)
+        self._log(logging.INFO, msg, category, args, kwargs)
 
     def warning(self, msg, category="", *args, **kwargs):
-        filename, lineno = self._get_caller_info()
-        extra = kwargs.get("extra", {})
-        extra["category"] = category
-        extra["real_filename"] = filename
-        extra["real_lineno"] = lineno
-        extra["local_trace"] = get_trace_id()
-        processed_msg = self._process_message(msg)
-        kwargs["extra"] = extra
-        self.logger.warning(processed_msg, *args, **kwargs)
+        self._log(logging.WARNING, msg, category, args, kwargs)
 
     def error(self, msg, category="", *args, **kwargs):
-        filename, lineno = self._get_caller_info()
-        extra = kwargs.get("extra", {})
-        extra["category"] = category
-        extra["real_filename"] = filename
-        extra["real_lineno"] = lineno
-        extra["local_trace"] = get_trace_id()
-        processed_msg = self._process_message(msg)
-        kwargs["extra"] = extra
-        self.logger.error(processed_msg, *args, **kwargs)
+        self._log(logging.ERROR, msg, category, args, kwargs)
 
     def critical(self, msg, category="", *args, **kwargs):
-        filename, lineno = self._get_caller_info()
-        extra = kwargs.get("extra", {})
-        extra["category"] = category
-        extra["real_filename"] = filename
-        extra["real_lineno"] = lineno
-        extra["local_trace"] = get_trace_id()
-        processed_msg = self._process_message(msg)
-        kwargs["extra"] = extra
-        self.logger.critical(processed_msg, *args, **kwargs)
+        self._log(logging.CRITICAL, msg, category, args, kwargs)
 
 
 # 默认实例化一个 logger
@@ -0,0 +1,68 @@
+"""
+重试工具
+为异步网络请求提供带指数退避和随机抖动的重试
+"""
+
+import asyncio
+import random
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from .logger import logger
+
+T = TypeVar("T")
+
+
+async def retry_with_backoff(func: Callable[[], Awaitable[T]],
+                             should_retry: Callable[[BaseException], bool],
+                             retry_after: Optional[Callable[[BaseException], Optional[float]]] = None,
+                             max_attempts: int = 5,
+                             initial_delay: float = 1.0,
+                             max_delay: float = 30.0) -> T:
+    """
+    执行异步调用，遇到可重试的错误时按指数退避重试
+    
+    等待使用asyncio.sleep，不会阻塞同一事件循环中的其他任务
+    
+    Args:
+        func: 无参数的异步函数，每次重试重新调用
+        should_retry: 判断异常是否可以重试
+        retry_after: 从异常中解析服务端要求的等待秒数（如Retry-After响应头），无法解析时返回None
+        max_attempts: 最大尝试次数
+        initial_delay: 首次重试前的基础等待时间（秒）
+        max_delay: 单次等待的最长时间（秒）
+        
+    Returns:
+        func的返回值
+    """
+    attempt = 1
+    while True:
+        try:
+            return await func()
+        except Exception as e:
+            if attempt >= max_attempts or not should_retry(e):
+                raise
+
+            delay = retry_after(e) if retry_after is not None else None
+            if delay is None:
+                # 指数退避加随机抖动，避免并发任务同时重试
+                delay = min(max_delay, initial_delay * 2 ** (attempt - 1)) + random.uniform(0, initial_delay)
+
+            logger.warning(f"请求失败，{delay:.1f}秒后进行第{attempt + 1}次尝试: {str(e)}")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+def parse_retry_after(value: Any) -> Optional[float]:
+    """
+    解析Retry-After响应头中的秒数
+    
+    Args:
+        value: 响应头的值
+        
+    Returns:
+        等待秒数，无法解析时返回None
+    """
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
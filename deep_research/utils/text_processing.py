@@ -62,8 +62,10 @@ def remove_reasoning_from_output(text: str) -> str:
         r'^.*?(?=\{|\[)',  # 移除JSON前的所有文本
     ]
 
+    # 每个模式只替换一次：不限次数时，re.sub 在位置0的空匹配之后还会继续匹配，
+    # 会把 JSON 对象开头到第一个 [ 之间的内容一起删掉
     for pattern in patterns:
-        text = re.sub(pattern, '', text, flags=re.IGNORECASE | re.DOTALL)
+        text = re.sub(pattern, '', text, count=1, flags=re.IGNORECASE | re.DOTALL)
 
     return text.strip()
 
@@ -189,12 +191,9 @@ def format_search_results_for_prompt(search_results: List[Dict[str, Any]],
     Returns:
         格式化后的内容列表
     """
-    formatted_results = []
-
-    for result in search_results:
-        content = result.get('content', '')
-        if content:
-            truncated_content = truncate_content(content, max_length)
-            formatted_results.append(truncated_content)
-
-    return formatted_results
+    # 返回片段列表而不是拼接后的字符串，由调用方统一序列化，避免重复拼接
+    return [
+        truncate_content(content, max_length)
+        for content in (result.get('content', '') for result in search_results)
+        if content
+    ]
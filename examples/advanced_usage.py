@@ -32,13 +32,12 @@ def advanced_example():
             max_content_length=15000,
             # 自定义输出
             output_dir="custom_reports",
-            save_intermediate_states=True
+            save_intermediate_states=True,
+            # 从环境变量设置API密钥
+            openai_api_key=os.getenv("OPENAI_API_KEY"),
+            tavily_api_key=os.getenv("TAVILY_API_KEY")
         )
 
-        # 从环境变量设置API密钥
-        config.openai_api_key = os.getenv("OPENAI_API_KEY")
-        config.tavily_api_key = os.getenv("TAVILY_API_KEY")
-
         if not config.validate():
             print("配置验证失败，请检查API密钥设置")
             return
@@ -3,14 +3,27 @@ Streamlit Web界面
 为Deep Search Agent提供友好的Web界面
 """
 
+from __future__ import annotations
+
 import os
 import sys
+import asyncio
+import time
 import streamlit as st
 from datetime import datetime
 import warnings
 import json
-import hashlib
+import io
+import itertools
+import zlib
+from operator import itemgetter
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+try:
+    import ijson
+except ImportError:  # ijson为可选依赖，未安装时使用json整体解析状态文件
+    ijson = None
 
 # 忽略 Streamlit 媒体文件存储错误（这是 Streamlit 的内部问题，不影响功能）
 warnings.filterwarnings('ignore', category=UserWarning, module='streamlit')
@@ -18,47 +31,202 @@ warnings.filterwarnings('ignore', category=UserWarning, module='streamlit')
 # 添加src目录到Python路径
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from deep_research import DeepSearchAgent, Config
+# Agent依赖LLM和搜索工具，只在开始研究时导入，浏览历史报告时不加载
+if TYPE_CHECKING:
+    from deep_research import DeepSearchAgent, Config
+
+# 报告和状态文件名的固定前缀和后缀，去掉后剩余的部分（查询和时间戳）用于关联两者
+_REPORT_PREFIX = 'deep_search_report_'
+_REPORT_SUFFIX = '.md'
+_PREFIX_LEN = len(_REPORT_PREFIX)
+_SUFFIX_LEN = len(_REPORT_SUFFIX)
+_STATE_PREFIX = 'state_'
+_STATE_SUFFIX = '.json'
+_STATE_PREFIX_LEN = len(_STATE_PREFIX)
+_STATE_SUFFIX_LEN = len(_STATE_SUFFIX)
+
+# 状态信息中段落总结的最大展示长度
+_SUMMARY_PREVIEW_LEN = 300
+
+# 预设的示例查询
+_EXAMPLE_QUERIES = (
+    "2025年人工智能发展趋势",
+    "深度学习在医疗领域的应用",
+    "区块链技术的最新发展",
+    "可持续能源技术趋势",
+    "量子计算的发展现状"
+)
 
 
 def get_historical_reports(output_dir="streamlit_reports"):
-    """获取历史报告列表"""
-    reports = []
+    """获取历史报告列表（未排序）"""
     if not os.path.exists(output_dir):
-        return reports
-    
-    for file in Path(output_dir).glob("deep_search_report_*.md"):
-        # 获取文件信息
-        stat = file.stat()
-        file_info = {
-            'filename': file.name,
-            'filepath': str(file),
-            'modified_time': datetime.fromtimestamp(stat.st_mtime),
-            'size': stat.st_size
-        }
-        
-        # 尝试找到对应的状态文件
-        state_file = file.with_name(file.name.replace('deep_search_report_', 'state_').replace('.md', '.json'))
-        if state_file.exists():
-            file_info['state_file'] = str(state_file)
-        
-        reports.append(file_info)
+        return []
+
+    # 目录的修改时间在增删文件时变化，作为缓存键的一部分，目录未变化时直接复用扫描结果
+    return _scan_reports(output_dir, os.stat(output_dir).st_mtime_ns)
+
+
+@st.cache_data(ttl=30)
+def _scan_reports(output_dir, dir_mtime_ns):
+    """扫描输出目录中的历史报告，结果按目录修改时间缓存"""
+    # 一次 scandir 把报告和状态文件按公共部分分类，DirEntry 自带 stat 信息，无需逐个 stat 和 exists
+    reports_by_key = {}
+    state_keys = set()
+    with os.scandir(output_dir) as it:
+        for entry in it:
+            name = entry.name
+            if name.startswith(_REPORT_PREFIX) and name.endswith(_REPORT_SUFFIX):
+                stat = entry.stat()
+                reports_by_key[name[_PREFIX_LEN:-_SUFFIX_LEN]] = {
+                    'filename': name,
+                    'filename_lower': name.lower(),  # 预先转小写，搜索筛选时直接使用
+                    'filepath': entry.path,
+                    'modified_time': stat.st_mtime,  # 浮点时间戳，用于排序
+                    'modified_time_str': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(stat.st_mtime)),
+                    'mtime_ns': stat.st_mtime_ns,
+                    'size': stat.st_size
+                }
+            elif name.startswith(_STATE_PREFIX) and name.endswith(_STATE_SUFFIX):
+                state_keys.add(name[_STATE_PREFIX_LEN:-_STATE_SUFFIX_LEN])
+
+    # 在内存中关联报告和对应的状态文件
+    for key in state_keys.intersection(reports_by_key):
+        reports_by_key[key]['state_file'] = os.path.join(output_dir, _STATE_PREFIX + key + _STATE_SUFFIX)
+
+    reports = list(reports_by_key.values())
     
-    # 按修改时间倒序排列
-    reports.sort(key=lambda x: x['modified_time'], reverse=True)
+    # 不在这里排序，由展示时按用户选择的方式排序一次
     return reports
 
 
-def update_status_info(container):
-    """更新状态信息显示"""
+@st.cache_data(max_entries=32)
+def _load_report(filepath, state_filepath, mtime_ns, size):
+    """
+    读取报告内容和对应的状态数据，按文件路径、修改时间和大小缓存，最多保留32份
+    
+    文件以字节读取，下载时直接使用，只在展示时解码
+    
+    Returns:
+        (报告Markdown字节, 状态文件字节, 状态摘要)，没有状态文件或解析失败时后两项为None
+    """
+    raw = Path(filepath).read_bytes()
+
+    state_raw, state_summary = None, None
+    if state_filepath:
+        try:
+            state_raw = Path(state_filepath).read_bytes()
+            # 直接解析已读取的字节，不再从磁盘读第二次
+            state_summary = _summarize_state(state_raw)
+        except (OSError, ValueError):
+            pass
+
+    return raw, state_raw, state_summary
+
+
+def _summarize_state(state_raw):
+    """
+    从状态文件的字节中提取界面需要展示的字段
+    
+    安装了ijson时流式解析，不构建完整的段落和搜索记录对象；段落总结只保留预览所需的长度
+    
+    Returns:
+        包含query、status和段落摘要列表的字典
+    """
+    if ijson is None:
+        state_data = json.loads(state_raw)
+        return {
+            'query': state_data.get('query', 'N/A'),
+            'status': state_data.get('status', 'N/A'),
+            'paragraphs': [
+                {
+                    'title': para.get('title', 'N/A'),
+                    'content': para.get('content', 'N/A'),
+                    'search_count': len(para.get('research', {}).get('search_history', [])),
+                    'reflection_iteration': para.get('research', {}).get('reflection_iteration', 0),
+                    # 多保留一个字符，展示时据此判断是否被截断
+                    'latest_summary': para.get('research', {}).get('latest_summary', '')[:_SUMMARY_PREVIEW_LEN + 1]
+                }
+                for para in state_data.get('paragraphs', [])
+            ]
+        }
+
+    summary = {'query': 'N/A', 'status': 'N/A', 'paragraphs': []}
+    para = None
+    for prefix, event, value in ijson.parse(io.BytesIO(state_raw)):
+        if prefix == 'paragraphs.item':
+            if event == 'start_map':
+                para = {'title': 'N/A', 'content': 'N/A', 'search_count': 0,
+                        'reflection_iteration': 0, 'latest_summary': ''}
+                summary['paragraphs'].append(para)
+        elif prefix in ('query', 'status'):
+            summary[prefix] = value
+        elif para is None:
+            continue
+        elif prefix in ('paragraphs.item.title', 'paragraphs.item.content'):
+            para[prefix.rsplit('.', 1)[1]] = value
+        elif prefix == 'paragraphs.item.research.search_history.item' and event == 'start_map':
+            para['search_count'] += 1
+        elif prefix == 'paragraphs.item.research.reflection_iteration':
+            para['reflection_iteration'] = int(value)
+        elif prefix == 'paragraphs.item.research.latest_summary':
+            para['latest_summary'] = value[:_SUMMARY_PREVIEW_LEN + 1]
+    return summary
+
+
+def _truncate(text, n=_SUMMARY_PREVIEW_LEN, suffix="..."):
+    """截断过长的文本用于预览，只切片不计算整个字符串的长度"""
+    head = text[:n + 1]
+    return head[:n] + suffix if len(head) > n else text
+
+
+def _widget_key(text):
+    """根据文本生成8位的组件key，只需要在会话内不冲突，使用非加密的CRC32即可"""
+    return f"{zlib.crc32(text.encode('utf-8')):08x}"
+
+
+def update_status_info(container, last_shown=None):
+    """
+    更新状态信息显示，内容与上次显示的相同时跳过，减少发送到浏览器的消息
+    
+    Args:
+        container: 状态信息容器
+        last_shown: 上次调用返回的显示内容
+        
+    Returns:
+        本次显示的内容，供下次调用比较
+    """
     if 'agent' in st.session_state and hasattr(st.session_state.agent, 'state'):
         progress = st.session_state.agent.get_progress_summary()
-        with container.container():
-            st.metric("总段落数", progress['total_paragraphs'])
-            st.metric("已完成", progress['completed_paragraphs'])
-            st.progress(progress['progress_percentage'] / 100)
+        shown = (progress['total_paragraphs'], progress['completed_paragraphs'], progress['progress_percentage'])
+        if shown != last_shown:
+            with container.container():
+                st.metric("总段落数", progress['total_paragraphs'])
+                st.metric("已完成", progress['completed_paragraphs'])
+                st.progress(progress['progress_percentage'] / 100)
+        return shown
     else:
         container.info("尚未开始研究")
+        return None
+
+
+class _ThrottledProgress:
+    """合并短时间内的进度条更新，减少发送到浏览器的消息"""
+
+    def __init__(self, progress_bar, min_interval=0.2):
+        self.progress_bar = progress_bar
+        self.min_interval = min_interval
+        self._last_value = None
+        self._last_time = 0.0
+
+    def progress(self, value, force=False):
+        """更新进度，与上次的值相同或距上次更新不足 min_interval 秒时跳过（force 为 True 时只跳过相同的值）"""
+        now = time.monotonic()
+        if value == self._last_value or (not force and now - self._last_time < self.min_interval):
+            return
+        self.progress_bar.progress(value)
+        self._last_value = value
+        self._last_time = now
 
 
 def main():
@@ -107,13 +275,16 @@ def show_historical_reports():
     # 筛选报告
     filtered_reports = reports
     if search_term:
-        filtered_reports = [r for r in reports if search_term.lower() in r['filename'].lower()]
+        needle = search_term.lower()
+        filtered_reports = [r for r in reports if needle in r['filename_lower']]
     
     # 排序
-    if sort_by == "最旧优先":
-        filtered_reports.sort(key=lambda x: x['modified_time'])
-    elif sort_by == "文件名":
-        filtered_reports.sort(key=lambda x: x['filename'])
+    if sort_by == "最新优先":
+        filtered_reports.sort(key=itemgetter('modified_time'), reverse=True)
+    elif sort_by == "最旧优先":
+        filtered_reports.sort(key=itemgetter('modified_time'))
+    else:
+        filtered_reports.sort(key=itemgetter('filename'))
     
     if not filtered_reports:
         st.warning("没有找到匹配的报告")
@@ -121,109 +292,112 @@ def show_historical_reports():
     
     # 显示报告列表
     for i, report in enumerate(filtered_reports):
+        # 为每个组件生成唯一的 key，使用时间戳和索引避免冲突
+        unique_id = f"{report['modified_time']}_{i}"
+
         with st.expander(
-            f"📄 {report['filename']} | {report['modified_time'].strftime('%Y-%m-%d %H:%M:%S')} | {report['size'] / 1024:.1f} KB",
+            f"📄 {report['filename']} | {report['modified_time_str']} | {report['size'] / 1024:.1f} KB",
             expanded=(i == 0)  # 默认展开第一个
         ):
-            # 读取报告内容
-            try:
-                with open(report['filepath'], 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # 创建子标签
-                if 'state_file' in report:
-                    report_tab, state_tab, download_tab = st.tabs(["报告内容", "状态信息", "下载"])
-                else:
-                    report_tab, download_tab = st.tabs(["报告内容", "下载"])
-                
-                with report_tab:
-                    st.markdown(content)
-                
-                # 状态信息标签
-                if 'state_file' in report:
-                    with state_tab:
-                        try:
-                            with open(report['state_file'], 'r', encoding='utf-8') as f:
-                                state_data = json.load(f)
-                            
-                            # 显示基本信息
-                            st.subheader("基本信息")
-                            col1, col2, col3 = st.columns(3)
-                            with col1:
-                                st.metric("查询", state_data.get('query', 'N/A'))
-                            with col2:
-                                st.metric("段落数", len(state_data.get('paragraphs', [])))
-                            with col3:
-                                st.metric("状态", state_data.get('status', 'N/A'))
-                            
-                            # 显示段落详情
-                            if 'paragraphs' in state_data:
-                                st.subheader("段落详情")
-                                for j, para in enumerate(state_data['paragraphs']):
-                                    with st.expander(f"段落 {j+1}: {para.get('title', 'N/A')}"):
-                                        st.write("**预期内容:**", para.get('content', 'N/A'))
-                                        if 'research' in para:
-                                            research = para['research']
-                                            st.write("**搜索次数:**", len(research.get('search_history', [])))
-                                            st.write("**反思次数:**", research.get('reflection_iteration', 0))
-                                            latest_summary = research.get('latest_summary', '')
-                                            if latest_summary:
-                                                st.write("**最终总结:**", latest_summary[:300] + "..." if len(latest_summary) > 300 else latest_summary)
-                        except Exception as e:
-                            st.error(f"读取状态文件失败: {str(e)}")
-                
-                # 下载标签
-                with download_tab:
-                    col1, col2 = st.columns(2)
-                    
-                    # 为每个下载按钮生成唯一的 key，使用时间戳和索引避免冲突
-                    unique_id = f"{report['modified_time'].timestamp()}_{i}"
+            # 折叠的 expander 内容同样会执行，除默认展开的第一个报告外，打开开关后才读取文件
+            if i == 0 or st.toggle("加载报告内容", key=f"opened_{report['filename']}"):
+                _render_report_details(report, unique_id)
+
+
+def _render_report_details(report, unique_id):
+    """渲染单个历史报告的内容、状态信息和下载选项"""
+    # 读取报告内容（报告和状态文件一起读取并缓存，各个标签页共用）
+    try:
+        raw, state_raw, state_summary = _load_report(
+            report['filepath'], report.get('state_file'), report['mtime_ns'], report['size']
+        )
+        
+        # 创建子标签
+        if 'state_file' in report:
+            report_tab, state_tab, download_tab = st.tabs(["报告内容", "状态信息", "下载"])
+        else:
+            report_tab, download_tab = st.tabs(["报告内容", "下载"])
+        
+        with report_tab:
+            st.markdown(raw.decode('utf-8'))
+        
+        # 状态信息标签
+        if 'state_file' in report:
+            with state_tab:
+                try:
+                    if state_summary is None:
+                        raise ValueError("状态文件不存在或格式错误")
                     
+                    # 显示基本信息
+                    st.subheader("基本信息")
+                    col1, col2, col3 = st.columns(3)
                     with col1:
-                        # 每次都重新编码数据，避免缓存问题
-                        report_data = content.encode('utf-8')
+                        st.metric("查询", state_summary['query'])
+                    with col2:
+                        st.metric("段落数", len(state_summary['paragraphs']))
+                    with col3:
+                        st.metric("状态", state_summary['status'])
+                    
+                    # 显示段落详情
+                    if state_summary['paragraphs']:
+                        st.subheader("段落详情")
+                        for j, para in enumerate(state_summary['paragraphs']):
+                            with st.expander(f"段落 {j+1}: {para['title']}"):
+                                st.write("**预期内容:**", para['content'])
+                                st.write("**搜索次数:**", para['search_count'])
+                                st.write("**反思次数:**", para['reflection_iteration'])
+                                latest_summary = para['latest_summary']
+                                if latest_summary:
+                                    st.write("**最终总结:**", _truncate(latest_summary))
+                except Exception as e:
+                    st.error(f"读取状态文件失败: {str(e)}")
+        
+        # 下载标签
+        with download_tab:
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.download_button(
+                    label="📄 下载Markdown报告",
+                    data=raw,
+                    file_name=report['filename'],
+                    mime="text/markdown",
+                    key=f"dl_md_{unique_id}",
+                    use_container_width=True
+                )
+            
+            with col2:
+                if 'state_file' in report:
+                    try:
+                        if state_raw is None:
+                            raise OSError("状态文件读取失败")
                         st.download_button(
-                            label="📄 下载Markdown报告",
-                            data=report_data,
-                            file_name=report['filename'],
-                            mime="text/markdown",
-                            key=f"dl_md_{unique_id}",
+                            label="📊 下载状态文件",
+                            data=state_raw,
+                            file_name=os.path.basename(report['state_file']),
+                            mime="application/json",
+                            key=f"dl_json_{unique_id}",
                             use_container_width=True
                         )
+                    except Exception as e:
+                        st.warning(f"状态文件下载暂时不可用")
+                else:
+                    st.info("无状态文件")
+            
+            # 删除按钮
+            st.divider()
+            if st.button(f"🗑️ 删除此报告", key=f"del_{unique_id}", type="secondary", use_container_width=True):
+                try:
+                    Path(report['filepath']).unlink(missing_ok=True)
+                    if 'state_file' in report:
+                        Path(report['state_file']).unlink(missing_ok=True)
+                    st.success("报告已删除！")
+                    st.rerun()
+                except Exception as e:
+                    st.error(f"删除失败: {str(e)}")
                     
-                    with col2:
-                        if 'state_file' in report:
-                            try:
-                                with open(report['state_file'], 'r', encoding='utf-8') as f:
-                                    state_content = f.read()
-                                state_data = state_content.encode('utf-8')
-                                st.download_button(
-                                    label="📊 下载状态文件",
-                                    data=state_data,
-                                    file_name=os.path.basename(report['state_file']),
-                                    mime="application/json",
-                                    key=f"dl_json_{unique_id}",
-                                    use_container_width=True
-                                )
-                            except Exception as e:
-                                st.warning(f"状态文件下载暂时不可用")
-                        else:
-                            st.info("无状态文件")
-                    
-                    # 删除按钮
-                    st.divider()
-                    if st.button(f"🗑️ 删除此报告", key=f"del_{unique_id}", type="secondary", use_container_width=True):
-                        try:
-                            os.remove(report['filepath'])
-                            if 'state_file' in report and os.path.exists(report['state_file']):
-                                os.remove(report['state_file'])
-                            st.success("报告已删除！")
-                            st.rerun()
-                        except Exception as e:
-                            st.error(f"删除失败: {str(e)}")
-                            
-            except Exception as e:
-                st.error(f"读取报告失败: {str(e)}")
+    except Exception as e:
+        st.error(f"读取报告失败: {str(e)}")
 
 
 def run_new_research():
@@ -269,15 +443,7 @@ def run_new_research():
 
         # 预设查询示例
         st.subheader("示例查询")
-        example_queries = [
-            "2025年人工智能发展趋势",
-            "深度学习在医疗领域的应用",
-            "区块链技术的最新发展",
-            "可持续能源技术趋势",
-            "量子计算的发展现状"
-        ]
-
-        selected_example = st.selectbox("选择示例查询", ["自定义"] + example_queries)
+        selected_example = st.selectbox("选择示例查询", ("自定义", *_EXAMPLE_QUERIES))
         if selected_example != "自定义":
             query = selected_example
 
@@ -327,6 +493,7 @@ def run_new_research():
             return
 
         # 创建配置
+        from deep_research import Config
         config = Config(
             deepseek_api_key=deepseek_key if llm_provider == "deepseek" else None,
             openai_api_key=openai_key if llm_provider == "openai" else None,
@@ -346,9 +513,12 @@ def run_new_research():
 
 def execute_research(query: str, config: Config, status_container=None):
     """执行研究"""
+    from deep_research import DeepSearchAgent
+    from deep_research.utils import run_sync
+
     try:
         # 创建进度条
-        progress_bar = st.progress(0)
+        progress_bar = _ThrottledProgress(st.progress(0))
         status_text = st.empty()
 
         # 初始化Agent
@@ -360,57 +530,21 @@ def execute_research(query: str, config: Config, status_container=None):
         if status_container:
             update_status_info(status_container)
 
-        progress_bar.progress(10)
-
-        # 生成报告结构
-        status_text.text("正在生成报告结构...")
-        agent._generate_report_structure(query)
-
-        # 更新状态信息（报告结构已生成，段落数已确定）
-        if status_container:
-            update_status_info(status_container)
-
-        progress_bar.progress(20)
-
-        # 处理段落
-        total_paragraphs = len(agent.state.paragraphs)
-        for i in range(total_paragraphs):
-            status_text.text(f"正在处理段落 {i+1}/{total_paragraphs}: {agent.state.paragraphs[i].title}")
-
-            # 初始搜索和总结
-            agent._initial_search_and_summary(i)
-            progress_value = 20 + (i + 0.5) / total_paragraphs * 60
-            progress_bar.progress(int(progress_value))
-
-            # 更新状态信息
-            if status_container:
-                update_status_info(status_container)
-
-            # 反思循环
-            agent._reflection_loop(i)
-            agent.state.paragraphs[i].research.mark_completed()
-
-            progress_value = 20 + (i + 1) / total_paragraphs * 60
-            progress_bar.progress(int(progress_value))
-
-            # 更新状态信息（段落处理完成）
-            if status_container:
-                update_status_info(status_container)
-
-        # 生成最终报告
-        status_text.text("正在生成最终报告...")
-        final_report = agent._generate_final_report()
-        progress_bar.progress(90)
+        progress_bar.progress(10, force=True)
 
-        # 保存报告
-        status_text.text("正在保存报告...")
-        agent._save_report(final_report)
-        progress_bar.progress(100)
+        # 生成结构、并发处理段落、生成并保存最终报告
+        final_report = run_sync(
+            _run_research_steps(agent, query, progress_bar, status_text, status_container)
+        )
 
         status_text.text("研究完成！")
 
         # 将结果保存到会话状态，避免重复生成下载按钮
         st.session_state.final_report = final_report
+        # 研究完成后搜索历史不再变化，汇总一次供结果页重复使用
+        st.session_state.all_searches = list(itertools.chain.from_iterable(
+            paragraph.research.search_history for paragraph in agent.state.paragraphs
+        ))
         st.session_state.research_completed = True
         # 设置下载时间戳，确保下载按钮使用稳定的key
         st.session_state.download_timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -423,6 +557,70 @@ def execute_research(query: str, config: Config, status_container=None):
         st.session_state.research_completed = False
 
 
+async def _run_research_steps(agent: DeepSearchAgent, query: str, progress_bar, status_text,
+                              status_container=None) -> str:
+    """分步骤执行研究，段落并发处理并实时更新进度"""
+    from deep_research.utils import gather_or_cancel
+
+    # 生成报告结构
+    status_text.text("正在生成报告结构...")
+    await agent._generate_report_structure(query)
+
+    # 更新状态信息（报告结构已生成，段落数已确定）
+    last_status = None
+    if status_container:
+        last_status = update_status_info(status_container)
+
+    progress_bar.progress(20, force=True)
+
+    # 每个段落分为初始搜索总结和反思循环两步
+    total_paragraphs = len(agent.state.paragraphs)
+    total_steps = max(1, total_paragraphs * 2)
+    finished_steps = 0
+    semaphore = asyncio.Semaphore(max(1, agent.config.max_concurrent_paragraphs))
+
+    def finish_step():
+        nonlocal finished_steps, last_status
+        finished_steps += 1
+        progress_bar.progress(int(20 + finished_steps / total_steps * 60))
+
+        # 更新状态信息
+        if status_container:
+            last_status = update_status_info(status_container, last_status)
+
+    async def process_paragraph(i: int):
+        async with semaphore:
+            status_text.text(f"正在处理段落 {i+1}/{total_paragraphs}: {agent.state.paragraphs[i].title}")
+
+            # 初始搜索和总结
+            await agent._initial_search_and_summary(i)
+            finish_step()
+
+            # 反思循环
+            await agent._reflection_loop(i)
+            agent.state.paragraphs[i].research.mark_completed()
+            finish_step()
+
+    try:
+        # 任意段落失败时取消其余段落，保证 aclose 之后不再有请求在后台运行
+        await gather_or_cancel(*(process_paragraph(i) for i in range(total_paragraphs)))
+
+        # 生成最终报告
+        status_text.text("正在生成最终报告...")
+        final_report = await agent._generate_final_report()
+        progress_bar.progress(90, force=True)
+    finally:
+        # 释放当前事件循环上的连接池
+        await agent.aclose()
+
+    # 保存报告
+    status_text.text("正在保存报告...")
+    agent._save_report(final_report)
+    progress_bar.progress(100, force=True)
+
+    return final_report
+
+
 def display_results(agent: DeepSearchAgent, final_report: str):
     """显示研究结果"""
     # 只在研究完成时显示结果
@@ -446,24 +644,20 @@ def display_results(agent: DeepSearchAgent, final_report: str):
         for i, paragraph in enumerate(agent.state.paragraphs):
             with st.expander(f"段落 {i+1}: {paragraph.title}"):
                 st.write("**预期内容:**", paragraph.content)
-                st.write("**最终内容:**", paragraph.research.latest_summary[:300] + "..."
-                        if len(paragraph.research.latest_summary) > 300
-                        else paragraph.research.latest_summary)
+                st.write("**最终内容:**", _truncate(paragraph.research.latest_summary))
                 st.write("**搜索次数:**", paragraph.research.get_search_count())
                 st.write("**反思次数:**", paragraph.research.reflection_iteration)
 
         # 搜索历史
         st.subheader("搜索历史")
-        all_searches = []
-        for paragraph in agent.state.paragraphs:
-            all_searches.extend(paragraph.research.search_history)
+        all_searches = st.session_state.get('all_searches', [])
 
         if all_searches:
             for i, search in enumerate(all_searches):
                 with st.expander(f"搜索 {i+1}: {search.query}"):
                     st.write("**URL:**", search.url)
                     st.write("**标题:**", search.title)
-                    st.write("**内容预览:**", search.content[:200] + "..." if len(search.content) > 200 else search.content)
+                    st.write("**内容预览:**", _truncate(search.content, 200))
                     if search.score:
                         st.write("**相关度评分:**", search.score)
 
@@ -475,11 +669,11 @@ def display_results(agent: DeepSearchAgent, final_report: str):
         timestamp = st.session_state.get('download_timestamp', datetime.now().strftime('%Y%m%d_%H%M%S'))
         
         if final_report:
-            # 每次都重新生成下载数据，避免缓存问题
+            # 下载数据每次直接编码，不用 st.cache_data：对整段文本求哈希比编码本身更慢
             col1, col2 = st.columns(2)
             
             # 生成唯一ID用于按钮key，确保唯一性
-            unique_key = hashlib.md5(f"{timestamp}_{id(final_report)}".encode()).hexdigest()[:8]
+            unique_key = _widget_key(f"{timestamp}_{id(final_report)}")
             
             with col1:
                 # Markdown报告下载
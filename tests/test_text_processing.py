@@ -0,0 +1,38 @@
+"""
+文本处理工具函数的解析测试
+"""
+
+import unittest
+
+from deep_research.utils.text_processing import (
+    remove_reasoning_from_output,
+    extract_clean_response
+)
+
+
+class TestReasoningRemoval(unittest.TestCase):
+
+    def test_bare_object_with_array(self):
+        """不带代码块的JSON对象中包含数组时，不能从第一个[处截断"""
+        output = '{"search_query": "AI芯片 2025 市场份额", "additional_queries": [], "reasoning": "补充数据"}'
+        self.assertEqual(remove_reasoning_from_output(output), output)
+
+        result = extract_clean_response(output)
+        self.assertEqual(result["search_query"], "AI芯片 2025 市场份额")
+        self.assertEqual(result["additional_queries"], [])
+
+    def test_leading_text_removed(self):
+        """JSON前的说明文字仍然会被移除"""
+        output = '好的，以下是结果：\n{"search_query": "q", "additional_queries": ["a"]}'
+        result = extract_clean_response(output)
+        self.assertEqual(result["additional_queries"], ["a"])
+
+    def test_fenced_object(self):
+        """```json 代码块包裹的输出正常解析"""
+        output = '```json\n{"search_query": "q", "additional_queries": ["a", "b"]}\n```'
+        result = extract_clean_response(output)
+        self.assertEqual(result["additional_queries"], ["a", "b"])
+
+
+if __name__ == "__main__":
+    unittest.main()